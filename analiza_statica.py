@@ -0,0 +1,130 @@
+from typing import List, Optional, TextIO, Tuple
+
+from graf import *
+from rang_stari import *
+from state_representation import *
+
+VERDICT_STARE_FINALA = 'stare_finala'
+VERDICT_FARA_SOLUTII = 'fara_solutii'
+
+# Explorarea exhaustiva din analiza se face doar pentru spatii mici (bitmap de cel mult 4 MB)
+# si este abandonata dupa un numar de stari accesibile, ca analiza sa ramana rapida.
+MAX_STARI_ANALIZA = 2**24
+MAX_STARI_ACCESIBILE_ANALIZA = 10000
+
+
+class RezultatAnaliza:
+    '''Verdictul analizei statice a unei instante.
+
+    Attributes:
+        tip: VERDICT_STARE_FINALA sau VERDICT_FARA_SOLUTII.
+        motiv: Explicatia verdictului, scrisa in fisierul de output.
+    '''
+    def __init__(self, tip: str, motiv: str = ''):
+        self.tip = tip
+        self.motiv = motiv
+
+
+def profil_final(state: State) -> Tuple[int, int]:
+    '''Profilul inaltimilor unei stari finale: m stive cu n+1 blocuri si k-m stive cu n blocuri.
+
+    Returns:
+        (n, m)
+    '''
+    num_blocuri = sum([stiva.get_height() for stiva in state.s])
+    return num_blocuri // len(state.s), num_blocuri % len(state.s)
+
+
+def blocuri_suportate(blocuri: List[Bloc]) -> List[int]:
+    '''Pentru fiecare bloc, numarul maxim de blocuri care pot sta deasupra lui: cate dintre
+    celelalte blocuri, luate de la cel mai usor, au greutatea totala cel mult egala cu rezistenta lui.'''
+    greutati = sorted([bloc.greutate for bloc in blocuri])
+    rezultat = []
+    for bloc in blocuri:
+        ramase = list(greutati)
+        ramase.remove(bloc.greutate)
+        numar = 0
+        suma = 0
+        for greutate in ramase:
+            suma += greutate
+            if suma > bloc.rezistenta:
+                break
+            numar += 1
+        rezultat.append(numar)
+    return rezultat
+
+
+def verifica_profil_final(state: State) -> Optional[str]:
+    '''Verifica daca blocurile pot fi asezate dupa profilul unei stari finale, tinand cont de rezistente.
+
+    Intr-o stare finala, pentru fiecare j, pozitiile cu cel putin j blocuri deasupra sunt
+    (k-m)*max(0, n-j) + m*max(0, n+1-j). Fiecare trebuie ocupata de un bloc diferit care
+    suporta cel putin j blocuri, deci (conditia lui Hall pentru multimi incluse una in alta)
+    trebuie sa existe cel putin atatea astfel de blocuri.
+
+    Returns:
+        Motivul pentru care nu exista stari finale sau None daca conditia este indeplinita.
+    '''
+    n, m = profil_final(state)
+    k = len(state.s)
+    suportate = blocuri_suportate([bloc for stiva in state.s for bloc in stiva.s])
+    for j in range(1, n+1):
+        necesare = (k-m) * max(0, n-j) + m * max(0, n+1-j)
+        disponibile = sum([1 for numar in suportate if numar >= j])
+        if disponibile < necesare:
+            return ('doar %d blocuri pot avea %d blocuri deasupra, iar o stare finala are nevoie de %d'
+                %(disponibile, j, necesare))
+    return None
+
+
+def explorare_limitata(start: State, max_stari: int = MAX_STARI_ANALIZA,
+        max_stari_accesibile: int = MAX_STARI_ACCESIBILE_ANALIZA) -> Optional[bool]:
+    '''Decide daca exista o stare finala accesibila, explorand exhaustiv spatiile mici (vezi rang_stari.py).
+
+    Returns:
+        True sau False daca explorarea a decis, None daca spatiul este prea mare.
+    '''
+    try:
+        rang_stari = RangStari(start)
+    except ValueError:
+        return None
+    if rang_stari.numar_stari > max_stari:
+        return None
+    vizitate = BitmapStari(rang_stari.numar_stari, 2)
+    numar_stari = 0
+    for rang, state, adancime in parcurgere_ranguri(rang_stari, start, vizitate):
+        if state.is_end_state():
+            return True
+        numar_stari += 1
+        if numar_stari > max_stari_accesibile:
+            return None
+    return False
+
+
+def analizeaza(start: State) -> Optional[RezultatAnaliza]:
+    '''Analiza rapida a unei instante, facuta inainte de cautari.
+
+    Returns:
+        Verdictul, daca instanta este rezolvata trivial sau nu are solutii, altfel None.
+    '''
+    if start.is_end_state():
+        return RezultatAnaliza(VERDICT_STARE_FINALA)
+
+    motiv = verifica_profil_final(start)
+    if motiv is not None:
+        return RezultatAnaliza(VERDICT_FARA_SOLUTII, motiv)
+
+    if next(start.mutari_valide(), None) is None:
+        return RezultatAnaliza(VERDICT_FARA_SOLUTII, 'din starea initiala nu se poate face nicio mutare')
+
+    if explorare_limitata(start) is False:
+        return RezultatAnaliza(VERDICT_FARA_SOLUTII, 'nicio stare accesibila nu este finala')
+    return None
+
+
+def scrie_verdict(rezultat: RezultatAnaliza, start: State, f: TextIO, start_time: float) -> None:
+    '''Scrie verdictul analizei: solutia triviala sau motivul pentru care nu exista solutii.'''
+    if rezultat.tip == VERDICT_STARE_FINALA:
+        NodParcurgere(start, None).afisare_drum(f, start_time)
+    else:
+        f.write('Instanta nu are solutii: ' + rezultat.motiv + '.\n')
@@ -0,0 +1,65 @@
+from typing import List
+import argparse
+import io
+import os
+import time
+
+import stopit
+
+from graf import *
+from priority_queues import *
+from state_representation import *
+from main import uniform_cost_search, a_star
+
+
+# (nume, algoritm, euristica)
+CAUTARI_BENCHMARK = [
+    ('UCS', uniform_cost_search, None),
+    ('A* adm1', a_star, 'euristica_admisibila_1'),
+    ('A* adm2', a_star, 'euristica_admisibila_2'),
+]
+
+
+def masoara(start: State, algoritm, euristica: str, numar_solutii: int, timeout: int) -> List:
+    '''Ruleaza o cautare si intoarce (expandari, generari, timp, a terminat inainte de timeout).'''
+    graf = Graf(start)
+    f = io.StringIO()
+    start_time = time.time()
+    with stopit.ThreadingTimeout(timeout) as to_ctx_mgr:
+        if euristica is None:
+            algoritm(graf, numar_solutii, f)
+        else:
+            algoritm(graf, numar_solutii, f, euristica)
+    terminat = to_ctx_mgr.state != to_ctx_mgr.TIMED_OUT
+    return [graf.numar_expandari, graf.numar_generari, time.time() - start_time, terminat]
+
+
+if __name__ == "__main__":
+    # compara politicile de departajare din priority_queues.py pe fisierele de input
+    parser = argparse.ArgumentParser()
+    parser.add_argument('input_folder')
+    parser.add_argument('NSOL', type=int)
+    parser.add_argument('timeout', type=int)
+    parser.add_argument('--seed', type=int, default=0,
+        help='Seed-ul pentru politica aleator.')
+    args = parser.parse_args()
+
+    for fisier_input in sorted(os.listdir(args.input_folder)):
+        start = State(args.input_folder + '/' + fisier_input)
+        if not start.is_valid():
+            continue
+        print(fisier_input)
+        print('%-10s %-14s %10s %10s %10s' % ('cautare', 'departajare', 'expandari', 'generari', 'timp'))
+        for nume, algoritm, euristica in CAUTARI_BENCHMARK:
+            for politica in POLITICI_DEPARTAJARE:
+                # in UCS, 'g_mare' este identica cu 'fifo' (vezi priority_queues.py)
+                if algoritm is uniform_cost_search and politica == 'g_mare':
+                    continue
+                for heap in (MinHeap, AstarMinHeap):
+                    heap.politica_departajare = politica
+                    heap.seed = args.seed
+                expandari, generari, durata, terminat = masoara(
+                    start, algoritm, euristica, args.NSOL, args.timeout)
+                print('%-10s %-14s %10d %10d %9.3fs%s' % (
+                    nume, politica, expandari, generari, durata, '' if terminat else ' (timeout)'))
+        print()
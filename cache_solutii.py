@@ -0,0 +1,164 @@
+from typing import Iterable, Optional, TextIO
+import hashlib
+import json
+import sqlite3
+import time
+
+from graf import *
+from state_representation import *
+
+# Trebuie incrementata la orice modificare care schimba solutiile sau ordinea lor.
+# Intrarile salvate cu alta versiune sunt sterse la deschiderea cache-ului.
+VERSIUNE_SOLVER = '1'
+
+STATUS_REZOLVAT = 'rezolvat'
+STATUS_EPUIZAT = 'epuizat'
+STATUS_TIMEOUT = 'timeout'
+
+
+def cheie_instanta(state: State) -> str:
+    '''Hash canonic al unei instante. Nu depinde de numele fisierului sau de spatiile albe din el.
+
+    Args:
+        state: Starea initiala a instantei.
+    '''
+    stive = []
+    for stiva in state.s:
+        if stiva.get_height() == 0:
+            stive.append('_')
+        else:
+            stive.append('|'.join(
+                bloc.nume + ',' + str(bloc.greutate) + ',' + str(bloc.rezistenta) for bloc in stiva.s))
+    return hashlib.sha256('\n'.join(stive).encode()).hexdigest()
+
+
+class JurnalSolutii:
+    '''Fisier de output care retine, pe langa text, solutiile gasite sub forma compacta.
+
+    Este transmis algoritmilor in locul fisierului; NodParcurgere.afisare_drum apeleaza
+    inregistreaza_solutie pentru fiecare drum gasit.
+
+    Attributes:
+        f: Fisierul in care se scrie de fapt.
+        evenimente: Lista de solutii si mesaje, in ordinea in care au fost scrise.
+    '''
+    def __init__(self, f: TextIO):
+        '''
+        Args:
+            f: Fisierul in care se scrie de fapt.
+        '''
+        self.f = f
+        self.evenimente = []
+        self._text_solutie = False
+
+    def inregistreaza_solutie(self, drum: Iterable[NodParcurgere], time_delta: float) -> None:
+        '''Retine mutarile, g si h pentru nodurile unui drum. Urmatorul write este textul drumului.'''
+        inregistreaza_solutie = getattr(self.f, 'inregistreaza_solutie', None)
+        if inregistreaza_solutie is not None:
+            inregistreaza_solutie(drum, time_delta)
+        self.evenimente.append({
+            'tip': 'solutie',
+            'timp': time_delta,
+            'mutari': [nod.mutare for nod in drum[1:]],
+            'g': [nod.g for nod in drum],
+            'h': [nod.h for nod in drum],
+        })
+        self._text_solutie = True
+
+    def write(self, text: str) -> None:
+        if self._text_solutie:
+            self._text_solutie = False
+        else:
+            self.evenimente.append({'tip': 'mesaj', 'text': text})
+        self.f.write(text)
+
+    def numar_solutii(self) -> int:
+        return sum([1 for eveniment in self.evenimente if eveniment['tip'] == 'solutie'])
+
+
+class CacheSolutii:
+    '''Cache persistent (SQLite) cu rezultatele cautarilor.
+
+    O intrare este identificata de (cheie_instanta, algoritm, euristica, NSOL) si retine evenimentele
+    din JurnalSolutii, statisticile parcurgerii si statusul cautarii (rezolvat / epuizat / timeout).
+    '''
+    def __init__(self, cale: str):
+        '''
+        Args:
+            cale: Fisierul bazei de date. Este creat daca nu exista.
+        '''
+        self.conexiune = sqlite3.connect(cale)
+        # tabelele facute inainte de adaugarea unei coloane nu pot fi completate, deci sunt refacute
+        coloane = [rand[1] for rand in self.conexiune.execute('PRAGMA table_info(solutii)')]
+        if len(coloane) > 0 and 'numar_reexpandari' not in coloane:
+            self.conexiune.execute('DROP TABLE solutii')
+        self.conexiune.execute(
+            'CREATE TABLE IF NOT EXISTS solutii ('
+            'instanta TEXT, algoritm TEXT, euristica TEXT, nsol INTEGER, versiune TEXT, '
+            'status TEXT, timeout INTEGER, evenimente TEXT, '
+            'numar_expandari INTEGER, numar_generari INTEGER, numar_reexpandari INTEGER, durata REAL, '
+            'PRIMARY KEY (instanta, algoritm, euristica, nsol))')
+        # intrarile facute de alte versiuni ale algoritmilor nu mai sunt valide
+        self.conexiune.execute('DELETE FROM solutii WHERE versiune != ?', (VERSIUNE_SOLVER,))
+        self.conexiune.commit()
+
+    def cauta(self, instanta: str, algoritm: str, euristica: str, nsol: int,
+            timeout: int) -> Optional[dict]:
+        '''Cauta rezultatul unei cautari.
+
+        O cautare oprita de timeout este refolosita doar daca timeout-ul ei nu este mai mic
+        decat cel curent.
+
+        Returns:
+            Intrarea gasita sau None.
+        '''
+        rand = self.conexiune.execute(
+            'SELECT status, timeout, evenimente, numar_expandari, numar_generari, numar_reexpandari, '
+            'durata FROM solutii '
+            'WHERE instanta = ? AND algoritm = ? AND euristica = ? AND nsol = ?',
+            (instanta, algoritm, euristica, nsol)).fetchone()
+        if rand is None:
+            return None
+        status, timeout_salvat, evenimente, numar_expandari, numar_generari, numar_reexpandari, durata = rand
+        if status == STATUS_TIMEOUT and timeout_salvat < timeout:
+            return None
+        return {
+            'status': status,
+            'evenimente': json.loads(evenimente),
+            'numar_expandari': numar_expandari,
+            'numar_generari': numar_generari,
+            'numar_reexpandari': numar_reexpandari,
+            'durata': durata,
+        }
+
+    def salveaza(self, instanta: str, algoritm: str, euristica: str, nsol: int, timeout: int,
+            status: str, jurnal: JurnalSolutii, graf: Graf, durata: float) -> None:
+        '''Salveaza (sau inlocuieste) rezultatul unei cautari.'''
+        self.conexiune.execute(
+            'INSERT OR REPLACE INTO solutii VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (instanta, algoritm, euristica, nsol, VERSIUNE_SOLVER, status, timeout,
+                json.dumps(jurnal.evenimente), graf.numar_expandari, graf.numar_generari,
+                graf.numar_reexpandari, durata))
+        self.conexiune.commit()
+
+    def inchide(self) -> None:
+        self.conexiune.close()
+
+
+def reda_solutii(intrare: dict, start: State, f: TextIO) -> None:
+    '''Scrie in f solutiile si mesajele unei intrari din cache, ca si cum cautarea ar fi rulat.
+
+    Args:
+        intrare: Intrarea returnata de CacheSolutii.cauta.
+        start: Starea initiala a instantei.
+        f: Fisierul in care sa fie scrise solutiile.
+    '''
+    for eveniment in intrare['evenimente']:
+        if eveniment['tip'] == 'mesaj':
+            f.write(eveniment['text'])
+            continue
+        nod = NodParcurgere(start, None, eveniment['g'][0], eveniment['h'][0])
+        for mutare, g, h in zip(eveniment['mutari'], eveniment['g'][1:], eveniment['h'][1:]):
+            # starile sunt reconstruite de afisare_drum
+            nod = NodParcurgere(None, nod, g, h, tuple(mutare))
+        nod.afisare_drum(f, time.time() - eveniment['timp'])
@@ -0,0 +1,188 @@
+from typing import Callable, Iterable, List, Optional, TextIO
+import gzip
+import os
+import pickle
+import time
+
+from graf import *
+from cache_solutii import *
+from priority_queues import Departajare
+
+
+class CheckpointCautare:
+    '''Salveaza periodic starea unei cautari (frontiera, seturile de noduri inchise, legaturile
+    catre parinti, contoarele) si o reia la o rulare urmatoare.
+
+    Nodurile sunt salvate sub forma compacta (indicele parintelui, mutarea, g, h, f), cu parintii
+    inaintea copiilor; starile sunt reconstruite din mutari cand nodurile sunt extrase din frontiera. Fisierul este comprimat
+    cu gzip si inlocuit atomic la fiecare salvare.
+
+    Daca cale este None, toate metodele nu fac nimic, ca algoritmii sa poata folosi aceeasi
+    implementare cu si fara checkpoint.
+
+    Attributes:
+        f: Fisierul in care algoritmul trebuie sa scrie solutiile. Cand checkpoint-ul este activ,
+            este un JurnalSolutii, ca solutiile gasite inainte de intrerupere sa poata fi reafisate.
+        frontiera: Nodurile din frontiera la reluare, in ordinea in care au fost salvate
+            (pentru UCS si A*, ordinea de extragere).
+        departajari: Componentele de departajare ale cheilor din frontiera la reluare
+            (pentru UCS si A*), altfel None.
+        expandate: Nodurile expandate la reluare (pentru A*).
+        numar_solutii: Numarul de solutii ramase de cautat la reluare.
+        timp_scurs: Timpul de cautare consumat inainte de reluare.
+    '''
+    def __init__(self, cale: Optional[str], algoritm: str, euristica: Optional[str], graf: Graf,
+            f: TextIO, interval: int = 10000, termen: Optional[float] = None,
+            departajare: Optional[Departajare] = None):
+        '''
+        Args:
+            cale: Fisierul checkpoint-ului sau None.
+            algoritm: Numele algoritmului, verificat la reluare.
+            euristica: Euristica algoritmului, verificata la reluare.
+            graf: Graful parcurgerii. Seturile si contoarele lui sunt salvate si restaurate.
+            f: Fisierul in care sunt scrise solutiile.
+            interval: Numarul de expandari dintre doua salvari.
+            termen: Momentul (time.time()) la care cautarea este salvata si oprita.
+            departajare: Departajarea frontierei (pentru UCS si A*). Politica ei este verificata
+                la reluare, iar starea ei (ordinea inserarilor, generatorul aleator) este salvata
+                si restaurata, ca o cautare reluata sa continue identic.
+        '''
+        self.cale = cale
+        self.algoritm = algoritm
+        self.euristica = euristica or ''
+        self.departajare = departajare
+        self.graf = graf
+        self.interval = interval
+        self.termen = termen
+        self.f = f if cale is None else JurnalSolutii(f)
+        self.frontiera = None
+        self.departajari = None
+        self.expandate = None
+        self.numar_solutii = None
+        self.timp_scurs = 0
+        self._ultima_salvare = 0
+
+    def incarca(self) -> bool:
+        '''Reia cautarea din fisier, daca acesta exista si a fost facut de acelasi algoritm
+        pe aceeasi instanta. Solutiile gasite inainte de intrerupere sunt scrise din nou in f.
+
+        Returns:
+            True daca s-a facut reluarea.
+        '''
+        if self.cale is None or not os.path.exists(self.cale):
+            return False
+        with gzip.open(self.cale, 'rb') as fisier:
+            date = pickle.load(fisier)
+        if (
+            date['versiune'] != VERSIUNE_SOLVER or
+            date['instanta'] != cheie_instanta(self.graf.start) or
+            date['algoritm'] != self.algoritm or
+            date['euristica'] != self.euristica or
+            date.get('departajare', '') != str(self.departajare or '')
+        ):
+            return False
+
+        noduri = []
+        for parinte, mutare, g, h, f in date['noduri']:
+            if parinte < 0:
+                nod = NodParcurgere(self.graf.start, None, g, h)
+            else:
+                nod = NodParcurgere(None, noduri[parinte], g, h, mutare)
+            nod.f = f
+            noduri.append(nod)
+        self.frontiera = [noduri[i] for i in date['frontiera']]
+        self.expandate = [noduri[i] for i in date['expandate']]
+        if self.departajare is not None and date.get('stare_departajare') is not None:
+            self.departajari = date['departajari']
+            self.departajare.restaureaza_starea(date['stare_departajare'])
+
+        self.graf.discovered = date['discovered']
+        self.graf.processed = date['processed']
+        self.graf.numar_expandari = date['numar_expandari']
+        self.graf.numar_generari = date['numar_generari']
+        self.numar_solutii = date['numar_solutii']
+        self.timp_scurs = date['timp_scurs']
+        self._ultima_salvare = self.graf.numar_expandari
+
+        reda_solutii({'evenimente': date['evenimente']}, self.graf.start, self.f.f)
+        self.f.evenimente = date['evenimente']
+        return True
+
+    def verifica(self, noduri: Callable[[], Iterable[Iterable[NodParcurgere]]], numar_solutii: int,
+            start_time: float) -> bool:
+        '''Salveaza cautarea daca s-au facut destule expandari de la ultima salvare sau daca
+        a trecut termenul. Trebuie apelata intre doua expandari.
+
+        Args:
+            noduri: Functie care intoarce (frontiera, expandate, departajari); este apelata doar
+                la salvare. departajari sunt componentele de departajare ale cheilor din frontiera,
+                in aceeasi ordine, sau None daca frontiera nu este un PQ.
+            numar_solutii: Numarul de solutii ramase de cautat.
+            start_time: Timpul la care a inceput cautarea.
+
+        Returns:
+            True daca a trecut termenul si cautarea trebuie oprita.
+        '''
+        if self.cale is None:
+            return False
+        termen_depasit = self.termen is not None and time.time() >= self.termen
+        if termen_depasit or self.graf.numar_expandari - self._ultima_salvare >= self.interval:
+            frontiera, expandate, departajari = noduri()
+            self.salveaza(frontiera, expandate, numar_solutii, start_time, departajari)
+        return termen_depasit
+
+    def salveaza(self, frontiera: Iterable[NodParcurgere], expandate: Iterable[NodParcurgere],
+            numar_solutii: int, start_time: float, departajari: Optional[List[tuple]] = None) -> None:
+        '''Scrie checkpoint-ul in fisier.'''
+        indici = {}
+        noduri = []
+
+        def adauga(nod: NodParcurgere) -> None:
+            # parintii primesc indici inaintea copiilor
+            lant = []
+            while nod is not None and id(nod) not in indici:
+                lant.append(nod)
+                nod = nod.parinte
+            for nod in reversed(lant):
+                parinte = -1 if nod.parinte is None else indici[id(nod.parinte)]
+                indici[id(nod)] = len(noduri)
+                noduri.append((parinte, nod.mutare, nod.g, nod.h, nod.f))
+
+        indici_frontiera = []
+        for nod in frontiera:
+            adauga(nod)
+            indici_frontiera.append(indici[id(nod)])
+        indici_expandate = []
+        for nod in expandate:
+            adauga(nod)
+            indici_expandate.append(indici[id(nod)])
+
+        date = {
+            'versiune': VERSIUNE_SOLVER,
+            'instanta': cheie_instanta(self.graf.start),
+            'algoritm': self.algoritm,
+            'euristica': self.euristica,
+            'departajare': str(self.departajare or ''),
+            'departajari': departajari,
+            'stare_departajare': None if self.departajare is None else self.departajare.salveaza_starea(),
+            'noduri': noduri,
+            'frontiera': indici_frontiera,
+            'expandate': indici_expandate,
+            'discovered': self.graf.discovered,
+            'processed': self.graf.processed,
+            'numar_expandari': self.graf.numar_expandari,
+            'numar_generari': self.graf.numar_generari,
+            'numar_solutii': numar_solutii,
+            'timp_scurs': time.time() - start_time,
+            'evenimente': self.f.evenimente,
+        }
+        temporar = self.cale + '.tmp'
+        with gzip.open(temporar, 'wb') as fisier:
+            pickle.dump(date, fisier, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporar, self.cale)
+        self._ultima_salvare = self.graf.numar_expandari
+
+    def finalizeaza(self) -> None:
+        '''Sterge checkpoint-ul dupa ce cautarea s-a terminat (solutii gasite sau spatiu epuizat).'''
+        if self.cale is not None and os.path.exists(self.cale):
+            os.remove(self.cale)
@@ -1,66 +1,121 @@
-from typing import Iterable, Optional, TextIO
+from typing import Iterable, Iterator, Optional, TextIO, Tuple
 import time
 
 from state_representation import *
+import numpy_backend
 
 # din laboratoare
 class NodParcurgere:
-    '''Un nod din arborele de parcurgere.'''
+    '''Un nod din arborele de parcurgere.
+
+    Nodul retine mutarea prin care a fost obtinut din parinte. Succesorii sunt construiti fara
+    stare; starea este reconstruita la nevoie, aplicand mutarile de la cel mai apropiat stramos
+    care inca o retine. Un nod o retine doar pe durata expandarii (vezi retine_starea si
+    elibereaza_starea); radacina o retine mereu.
+
+    Attributes:
+        backend: 'python' sau 'numpy'. Cu 'numpy', mutarile valide si euristica succesorilor
+            sunt calculate vectorizat (vezi numpy_backend.py), cu aceleasi rezultate.
+    '''
+    __slots__ = ('_state', 'parinte', 'mutare', 'g', 'h', 'f')
+    backend = 'python'
+
     def __init__(self, state: State, parinte: 'NodParcurgere',
-            g: Optional[int] = 0, h: Optional[int] = 0, cost: Optional[int] = 0):
+            g: Optional[int] = 0, h: Optional[int] = 0, mutare: Optional[Tuple[int, int]] = None):
         '''
         Args:
             state: Starea pentru care este facut nodul.
             parinte: Nodul care precede nodul curent in arborele de cautare.
             g: Costul drumului de la origine la nodul curent.
             h: Costul estimat al drumului de la nodul curent la o stare finala.
-            cost: Costul muchiei de la nodul parinte la nodul curent.
+            mutare: Perechea (sursa, destinatie) prin care se ajunge din parinte in nodul curent.
         '''
-        self.state = state
+        self._state = state
         self.parinte = parinte #parintele din arborele de parcurgere
+        self.mutare = mutare
         self.g = g
         self.h = h
         self.f = self.g+self.h
-        self.cost = cost
+
+    @property
+    def state(self) -> State:
+        '''Starea nodului, reconstruita din mutari daca a fost eliberata.'''
+        if self._state is not None:
+            return self._state
+        mutari = []
+        nod = self
+        while nod._state is None:
+            mutari.append(nod.mutare)
+            nod = nod.parinte
+        # o singura copie a starii stramosului, apoi mutarile sunt facute pe loc
+        sursa, destinatie = mutari.pop()
+        state = nod._state.aplica_mutare(sursa, destinatie)
+        for sursa, destinatie in reversed(mutari):
+            state.s[destinatie].s.append(state.s[sursa].s.pop())
+        return state
+
+    def elibereaza_starea(self) -> None:
+        '''Renunta la starea retinuta in nod. Radacina isi pastreaza mereu starea.'''
+        if self.parinte is not None:
+            self._state = None
+
+    def retine_starea(self) -> None:
+        '''Reconstruieste starea nodului, daca a fost eliberata, si o retine in nod.'''
+        self._state = self.state
 
     def obtine_drum(self) -> Iterable['NodParcurgere']:
         '''Obtine drumul de la origine la nodul curent.'''
-        l=[self];
+        l=[]
         nod=self
-        while nod.parinte is not None:
-            l.insert(0, nod.parinte)
+        while nod is not None:
+            l.append(nod)
             nod=nod.parinte
+        l.reverse()
         return l
 
     def afisare_drum(self, f: TextIO, start_time: float) -> None:
         '''Afiseaza drumul la stdout si in fisierul f.
+
+        Daca f are o metoda inregistreaza_solutie (ex: cache_solutii.JurnalSolutii), aceasta este
+        apelata cu drumul si timpul de gasire, inainte ca drumul sa fie scris in fisier.
         
         Args:
             f: Fisierul in care sa fie scris drumul.
             start_time: Timpul la care a inceput cautarea acestei solutii.'''
         time_delta = time.time() - start_time
-        # print('Timpul pentru gasirea solutiei:', time_delta)
-        f.write('Timpul pentru gasirea solutiei:' + str(time_delta) + '\n')
-
         drum = self.obtine_drum()
 
+        inregistreaza_solutie = getattr(f, 'inregistreaza_solutie', None)
+        if inregistreaza_solutie is not None:
+            inregistreaza_solutie(drum, time_delta)
+
+        # print('Timpul pentru gasirea solutiei:', time_delta)
+        text = 'Timpul pentru gasirea solutiei:' + str(time_delta) + '\n'
+
+        # starile sunt reconstruite o singura data, de la radacina
+        states = [drum[0].state]
         cost_drum = 0
-        for nod in drum:
-            cost_drum += nod.cost
+        for nod in drum[1:]:
+            sursa, destinatie = nod.mutare
+            cost_drum += states[-1].s[sursa].s[-1].greutate
+            states.append(states[-1].aplica_mutare(sursa, destinatie))
 
         # print('Lungimea drumului:', len(drum))
-        f.write('Lungimea drumului: ' + str(len(drum)) + '\n')
-        f.write('Costul drumului:' + str(cost_drum) + '\n')
+        text += 'Lungimea drumului: ' + str(len(drum)) + '\n'
+        text += 'Costul drumului:' + str(cost_drum) + '\n'
 
-        for index_nod, nod in enumerate(drum):
+        for index_nod, (nod, state) in enumerate(zip(drum, states)):
             # print(str(index_nod+1) + ')')
-            # print(nod.state.to_string())
-            f.write(str(index_nod+1) + ')\n')
-            f.write('g = ' + str(nod.g) + '\n')
-            f.write('h = ' + str(nod.h) + '\n')
-            f.write(nod.state.to_string() + '\n')
-        # print(16 * len(self.state.s) * '_')
-        f.write(16 * len(self.state.s) * '_' + '\n')
+            # print(state.to_string())
+            text += str(index_nod+1) + ')\n'
+            text += 'g = ' + str(nod.g) + '\n'
+            text += 'h = ' + str(nod.h) + '\n'
+            text += state.to_string() + '\n'
+        # print(16 * len(states[-1].s) * '_')
+        text += 16 * len(states[-1].s) * '_' + '\n'
+
+        # drumul este scris o singura data
+        f.write(text)
 
 
     def calculeaza_h(self, state: State, tip_euristica: str = 'euristica_banala'):
@@ -154,6 +209,44 @@ class NodParcurgere:
             return cost
 
 
+    def evalueaza_mutari(self, euristica: str = 'euristica_banala') -> Iterator[Tuple[int, int, int, int]]:
+        '''
+        Genereaza lenes mutarile valide si euristica starilor in care duc, fara a construi succesorii.
+        Args:
+            euristica: 'euristica_banala', 'euristica_admisibila_1', 'euristica_admisibila_2',
+                orice altceva este o euristica neadmisibila.
+        Yields:
+            Tupluri (sursa, destinatie, cost, h).
+        '''
+        state = self.state
+        if self.backend == 'numpy':
+            mutari, costs, hs = numpy_backend.genereaza_succesori(state, euristica)
+            for (sursa, destinatie), cost, h in zip(mutari, costs, hs):
+                yield sursa, destinatie, cost, h
+            return
+
+        for sursa, destinatie, cost in state.mutari_valide():
+            with state.mutare_temporara(sursa, destinatie) as state_successor:
+                h = self.calculeaza_h(state_successor, euristica)
+            yield sursa, destinatie, cost, h
+
+    def creeaza_succesor(self, sursa: int, destinatie: int, cost: int, h: int) -> 'NodParcurgere':
+        '''Construieste nodul obtinut prin mutarea (sursa, destinatie), evaluata de evalueaza_mutari.
+        Nodul nu retine starea: aceasta este reconstruita din parinte cand este ceruta, iar nodurile
+        expandate o retin pe durata expandarii (vezi retine_starea).'''
+        return NodParcurgere(None, self, cost+self.g, h, (sursa, destinatie))
+
+    def succesori_lazy(self, euristica: str = 'euristica_banala') -> Iterator['NodParcurgere']:
+        '''
+        Genereaza lenes succesorii nodului curent; starea unui succesor este construita doar
+        cand acesta este cerut.
+        Args:
+            euristica: 'euristica_banala', 'euristica_admisibila_1', 'euristica_admisibila_2',
+                orice altceva este o euristica neadmisibila.
+        '''
+        for sursa, destinatie, cost, h in self.evalueaza_mutari(euristica):
+            yield self.creeaza_succesor(sursa, destinatie, cost, h)
+
     def generate_successors(self, euristica: str ='euristica_banala') -> Iterable['NodParcurgere']:
         '''
         Genereaza succesorii nodului curent.
@@ -161,12 +254,7 @@ class NodParcurgere:
             tip_euristica: 'euristica_banala', 'euristica_admisibila_1', 'euristica_admisibila_2',
                 orice altceva este o euristica neadmisibila.
         '''
-        successors = []
-        state_successors, costs = self.state.generate_successors()
-        for state_successor, cost in zip(state_successors, costs):
-            h = self.calculeaza_h(state_successor, euristica)
-            successors.append(NodParcurgere(state_successor, self, cost+self.g, h, cost))
-        return successors
+        return list(self.succesori_lazy(euristica))
 
     def is_end_state(self):
         return self.state.is_end_state()
@@ -179,6 +267,12 @@ class Graf:
         start: Starea de la care se va incepe fiecare parcurgere a grafului.
         discovered: Set care contine nodurile descoperite in parcurgere.
         processed: Set care contine nodurile procesate in parcurgere.
+        numar_expandari: Numarul de noduri expandate in parcurgere.
+        numar_generari: Numarul de noduri succesoare construite in parcurgere.
+        numar_reexpandari: Numarul de expandari ale unor stari care fusesera deja expandate.
+
+    Seturile retin reprezentarea sub forma de string a starilor, nu obiectele State,
+    ca starile sa poata fi eliberate din noduri dupa expandare.
     '''
     def __init__(self, start: State):
         '''
@@ -188,20 +282,43 @@ class Graf:
         self.start = start
         self.discovered = set()
         self.processed = set()
+        self.numar_expandari = 0
+        self.numar_generari = 0
+        self.numar_reexpandari = 0
 
     def set_discovered(self, state: State):
-        self.discovered.add(state)
+        self.discovered.add(str(state))
 
     def is_discovered(self, state: State) -> bool:
-        return state in self.discovered
+        return str(state) in self.discovered
 
     def set_processed(self, state: State):
-        self.processed.add(state)
+        self.processed.add(str(state))
     
     def is_processed(self, state: State) -> bool:
-        return state in self.processed
+        return str(state) in self.processed
+
+    def inregistreaza_expandare(self, numar_succesori: int):
+        self.numar_expandari += 1
+        self.numar_generari += numar_succesori
+
+    def inregistreaza_reexpandare(self, state: State) -> None:
+        '''Marcheaza starea ca procesata si numara expandarea daca starea fusese deja procesata.
+        Trebuie apelata inainte de expandarea starii.'''
+        if self.is_processed(state):
+            self.numar_reexpandari += 1
+        else:
+            self.set_processed(state)
+
+    def reset(self, statistici: bool = True):
+        '''Sterge toate informatiile despre procesarea si descoperirea nodurilor.
 
-    def reset(self):
-        '''Sterge toate informatiile despre procesarea si descoperirea nodurilor.'''
+        Args:
+            statistici: Daca sunt resetate si contoarele de noduri expandate, generate si reexpandate.
+        '''
         self.discovered.clear()
-        self.processed.clear()
\ No newline at end of file
+        self.processed.clear()
+        if statistici:
+            self.numar_expandari = 0
+            self.numar_generari = 0
+            self.numar_reexpandari = 0
\ No newline at end of file
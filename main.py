@@ -1,5 +1,7 @@
-from typing import TextIO
+from typing import Dict, Optional, TextIO
 from collections import deque
+import argparse
+import heapq
 import sys
 import stopit
 import time
@@ -7,37 +9,63 @@ import os
 
 from graf import *
 from priority_queues import *
+from cache_solutii import *
+from checkpoint import *
+from rang_stari import *
+from analiza_statica import *
 from state_representation import *
+import numpy_backend
 
 
-def breadth_first_search(graf: Graf, numar_solutii: int, f: TextIO = None) -> None:
+def breadth_first_search(graf: Graf, numar_solutii: int, f: TextIO = None,
+        checkpoint: Optional[str] = None, interval_checkpoint: int = 10000,
+        termen: Optional[float] = None) -> None:
     '''Implementare BFS. In parcurgere starile apar o singura data.
 
     Args:
         graf: Graful pe care sa se faca parcurgerea.
         numar_solutii: Numarul de solutii care sa fie cautate.
         f: Fisierul in care sa fie scrise solutiile.
+        checkpoint: Fisierul in care este salvata periodic cautarea si din care este reluata.
+        interval_checkpoint: Numarul de expandari dintre doua salvari.
+        termen: Momentul (time.time()) la care cautarea este salvata si oprita.
     '''
     start_time = time.time()
+    ckpt = CheckpointCautare(checkpoint, 'breadth_first_search', None, graf, f,
+        interval_checkpoint, termen)
+    f = ckpt.f
     frontier = deque()
-    frontier.append(NodParcurgere(graf.start, None))
-    graf.set_discovered(graf.start)
+    if ckpt.incarca():
+        frontier.extend(ckpt.frontiera)
+        numar_solutii = ckpt.numar_solutii
+        start_time -= ckpt.timp_scurs
+    else:
+        frontier.append(NodParcurgere(graf.start, None))
+        graf.set_discovered(graf.start)
 
     while len(frontier) > 0:
+        if ckpt.verifica(lambda: (frontier, [], None), numar_solutii, start_time):
+            return
         node = frontier.popleft()
+        node.retine_starea()
 
         if node.is_end_state():
             node.afisare_drum(f, start_time)
             numar_solutii -= 1
             if numar_solutii <= 0:
+                ckpt.finalizeaza()
                 return
 
         toti_succesorii = node.generate_successors()
+        graf.inregistreaza_expandare(len(toti_succesorii))
 
         for succesor in toti_succesorii:
-            if not graf.is_discovered(succesor.state):
-                graf.set_discovered(succesor.state)
+            state_succesor = succesor.state
+            if not graf.is_discovered(state_succesor):
+                graf.set_discovered(state_succesor)
                 frontier.append(succesor)
+        node.elibereaza_starea()
+    ckpt.finalizeaza()
 
 
 def depth_first_search(graf: Graf, numar_solutii: int, f: TextIO = None) -> None:
@@ -68,16 +96,20 @@ def df(nod: NodParcurgere, num_solutii_cautate: int, f: TextIO = None, start_tim
     '''
     if num_solutii_cautate <= 0:
         return num_solutii_cautate
+    nod.retine_starea()
     if nod.is_end_state():
         nod.afisare_drum(f, start_time)
         num_solutii_cautate -= 1
         if num_solutii_cautate == 0:
             return num_solutii_cautate
     toti_succesorii = nod.generate_successors()
+    graf.inregistreaza_expandare(len(toti_succesorii))
     for succesor in toti_succesorii:
-        if num_solutii_cautate > 0 and not graf.is_discovered(succesor.state):
-            graf.set_discovered(succesor.state)
+        state_succesor = succesor.state
+        if num_solutii_cautate > 0 and not graf.is_discovered(state_succesor):
+            graf.set_discovered(state_succesor)
             num_solutii_cautate = df(succesor, num_solutii_cautate, f, start_time)
+    nod.elibereaza_starea()
     return num_solutii_cautate
 
 
@@ -96,7 +128,7 @@ def depth_first_iterativ(graf: Graf, numar_solutii: int, f: TextIO = None):
         while True:
             if numar_solutii == 0:
                 return
-            graf.reset()
+            graf.reset(statistici=False)
             numar_solutii = dfi(NodParcurgere(graf.start, None), i, numar_solutii, f, start_time)
             i += 1
     except RecursionError as e:
@@ -120,41 +152,67 @@ def dfi(nod: NodParcurgere, adancime: int, numar_solutii: int, f: TextIO = None,
         if numar_solutii == 0:
             return numar_solutii
     if adancime > 1:
+        nod.retine_starea()
         toti_succesorii = nod.generate_successors()
+        graf.inregistreaza_expandare(len(toti_succesorii))
         for succesor in toti_succesorii:
-            if numar_solutii > 0 and not graf.is_discovered(succesor.state):
-                graf.set_discovered(succesor.state)
+            state_succesor = succesor.state
+            if numar_solutii > 0 and not graf.is_discovered(state_succesor):
+                graf.set_discovered(state_succesor)
                 numar_solutii = dfi(succesor, adancime-1, numar_solutii, f, start_time)
+        nod.elibereaza_starea()
     return numar_solutii
 
 
-def uniform_cost_search(graf: Graf, numar_solutii: int, f: TextIO = None):
+def uniform_cost_search(graf: Graf, numar_solutii: int, f: TextIO = None,
+        checkpoint: Optional[str] = None, interval_checkpoint: int = 10000,
+        termen: Optional[float] = None):
     '''Implementare UCS care evita repetarea aceleiasi stari in frontiera.
     
     Args:
         graf: Graful pe care sa se faca parcurgerea.
         numar_solutii: Numarul de solutii care sa fie cautate.
         f: Fisierul in care sa fie scrise solutiile.
+        checkpoint: Fisierul in care este salvata periodic cautarea si din care este reluata.
+        interval_checkpoint: Numarul de expandari dintre doua salvari.
+        termen: Momentul (time.time()) la care cautarea este salvata si oprita.
     '''
     start_time = time.time()
-    nod = NodParcurgere(graf.start, None)
     frontier = MinHeap()
-    frontier.insert(nod)
+    ckpt = CheckpointCautare(checkpoint, 'uniform_cost_search', None, graf, f,
+        interval_checkpoint, termen, frontier.departajare)
+    f = ckpt.f
+    if ckpt.incarca():
+        frontier.inserare_ordonata(ckpt.frontiera, ckpt.departajari)
+        numar_solutii = ckpt.numar_solutii
+        start_time -= ckpt.timp_scurs
+    else:
+        nod = NodParcurgere(graf.start, None)
+        frontier.insert(nod)
     # voi folosi graf.is_processed() ca set de noduri expandate
 
     while not frontier.is_empty():
+        if ckpt.verifica(lambda: (frontier.noduri(), [], frontier.departajari()), numar_solutii,
+                start_time):
+            return
         nod = frontier.extract_min()
+        nod.retine_starea()
         if nod.is_end_state():
             nod.afisare_drum(f, start_time)
             numar_solutii -= 1
             if numar_solutii <= 0:
+                ckpt.finalizeaza()
                 return
         graf.set_processed(nod.state)
         
         toti_succesorii = nod.generate_successors()
+        graf.inregistreaza_expandare(len(toti_succesorii))
         for successor in toti_succesorii:
-            if not graf.is_processed(successor.state):
-                frontier.insert(successor)
+            cheie = str(successor.state)
+            if not cheie in graf.processed:
+                frontier.insert(successor, stare=cheie)
+        nod.elibereaza_starea()
+    ckpt.finalizeaza()
 
 
 def a_star_naiv(graf: Graf, numar_solutii: int, f: TextIO = None, euristica: str = 'euristica_banala'):
@@ -178,18 +236,24 @@ def a_star_naiv(graf: Graf, numar_solutii: int, f: TextIO = None, euristica: str
 
     while not frontier.is_empty():
         nod = frontier.extract_min()
+        nod.retine_starea()
         if nod.is_end_state():
             nod.afisare_drum(f, start_time)
             numar_solutii -= 1
             if numar_solutii <= 0:
                 return
+        graf.inregistreaza_reexpandare(nod.state)
 
         toti_succesorii = nod.generate_successors(euristica)
+        graf.inregistreaza_expandare(len(toti_succesorii))
         for successor in toti_succesorii:
             frontier.insert(successor)
+        nod.elibereaza_starea()
 
 
-def a_star(graf: Graf, numar_solutii: int, f: TextIO = None, euristica: str = 'euristica_banala'):
+def a_star(graf: Graf, numar_solutii: int, f: TextIO = None, euristica: str = 'euristica_banala',
+        checkpoint: Optional[str] = None, interval_checkpoint: int = 10000,
+        termen: Optional[float] = None):
     '''Implementare A* care evita repetarea aceleiasi stari in frontiera.
     Starile expandate sunt mapate la nodurile cu distanta minima fata de origine.
 
@@ -199,200 +263,620 @@ def a_star(graf: Graf, numar_solutii: int, f: TextIO = None, euristica: str = 'e
         f: Fisierul in care sa fie scrise solutiile.
         euristica: Euristica de folosit pentru calcularea lui h(nod). Poate fi 'euristica_banala',
             'euristica_admisibila_1', 'euristica_admisibila_2', 'euristica_neadmisibila'.
+        checkpoint: Fisierul in care este salvata periodic cautarea si din care este reluata.
+        interval_checkpoint: Numarul de expandari dintre doua salvari.
+        termen: Momentul (time.time()) la care cautarea este salvata si oprita.
     '''
     start_time = time.time()
-    # nu conteaza f(nod_start)
-    nod = NodParcurgere(graf.start, None)
-    nod.h = nod.calculeaza_h(nod.state, euristica)
-    nod.f = nod.h
     frontier = AstarMinHeap()
-    # map: state -> node
+    ckpt = CheckpointCautare(checkpoint, 'a_star', euristica, graf, f, interval_checkpoint, termen,
+        frontier.departajare)
+    f = ckpt.f
+    # map: str(state) -> node
     expanded = {}
-    frontier.insert(nod)
+    if ckpt.incarca():
+        frontier.inserare_ordonata(ckpt.frontiera, ckpt.departajari)
+        for nod in ckpt.expandate:
+            expanded[str(nod.state)] = nod
+        numar_solutii = ckpt.numar_solutii
+        start_time -= ckpt.timp_scurs
+    else:
+        # nu conteaza f(nod_start)
+        nod = NodParcurgere(graf.start, None)
+        nod.h = nod.calculeaza_h(nod.state, euristica)
+        nod.f = nod.h
+        frontier.insert(nod)
 
     while not frontier.is_empty():
+        if ckpt.verifica(lambda: (frontier.noduri(), expanded.values(), frontier.departajari()),
+                numar_solutii, start_time):
+            return
         nod = frontier.extract_min()
+        nod.retine_starea()
         if nod.is_end_state():
             nod.afisare_drum(f, start_time)
             numar_solutii -= 1
             if numar_solutii <= 0:
+                ckpt.finalizeaza()
                 return
-        expanded[nod.state] = nod
+        expanded[str(nod.state)] = nod
 
         toti_succesorii = nod.generate_successors(euristica)
+        graf.inregistreaza_expandare(len(toti_succesorii))
         for successor in toti_succesorii:
-            if not successor.state in expanded:
-                frontier.insert(successor)
+            cheie = str(successor.state)
+            if not cheie in expanded:
+                frontier.insert(successor, stare=cheie)
             else:
                 # modific drumul daca a fost gasit ceva mai bun
-                if successor.g < expanded[successor.state].g:
+                if successor.g < expanded[cheie].g:
                     # nu modific nodul in sine pentru ca s-ar schimba referinta si nu s-ar mai modifica drumul
-                    expanded[successor.state].f = successor.f
-                    expanded[successor.state].g = successor.g
-                    expanded[successor.state].parinte = successor.parinte
-
-
-if __name__ == "__main__":
-    # input folder, output folder, NSOL, timeout
-    argc = len(sys.argv)
-    if argc != 5:
-        print('Usage: %s input_folder output_folder NSOL timeout'%(sys.argv[0]))
-        sys.exit(1)
-    
-    if not os.path.exists(sys.argv[1]):
-        print('Input folder \'%s\' does not exist.'%(sys.argv[1]))
-        sys.exit(1)
-    if not os.path.exists(sys.argv[2]):
-        print('Output folder \'%s\' does not exist.'%(sys.argv[2]))
-        sys.exit(1)
-
-    fisiere_input = os.listdir(sys.argv[1])
-    print(fisiere_input)
-    fisiere_output = os.listdir(sys.argv[2])
-
-    for fisier_input, fisier_output in zip(fisiere_input, fisiere_output):
-        # print('Solutii pentru ', fisier_input)
-        # print()
-        start = State(sys.argv[1] + '/' + fisier_input)
-        graf = Graf(start)
-
-        if not start.is_valid():
-            print('Initial state is invalid.')
-            sys.exit(1)
-
-        f = open(sys.argv[2] + '/' + fisier_output, 'w')
-        f.truncate()
-
-        # print(graf.start.to_string())
-
-        # print('==========================BFS==========================')
-        f.write('\n==========================BFS==========================\n')
-        with stopit.ThreadingTimeout(int(sys.argv[4])) as to_ctx_mgr:
-            assert to_ctx_mgr.state == to_ctx_mgr.EXECUTING
-            breadth_first_search(graf, int(sys.argv[3]), f)
-
-        # print(graf.start.to_string())
-
-        graf.reset()
-
-        # print(graf.start.to_string())
+                    expanded[cheie].f = successor.f
+                    expanded[cheie].g = successor.g
+                    expanded[cheie].parinte = successor.parinte
+                    expanded[cheie].mutare = successor.mutare
+        nod.elibereaza_starea()
+    ckpt.finalizeaza()
 
-        # print('==========================DFS==========================')
-        f.write('\n==========================DFS==========================\n')
-        with stopit.ThreadingTimeout(int(sys.argv[4])) as to_ctx_mgr:
-            assert to_ctx_mgr.state == to_ctx_mgr.EXECUTING
-            depth_first_search(graf, int(sys.argv[3]), f)
 
-        # print(graf.start.to_string())
+def a_star_partial(graf: Graf, numar_solutii: int, f: TextIO = None, euristica: str = 'euristica_banala'):
+    '''Implementare A* cu expandare partiala (PEA*).
+    La expandarea unui nod se calculeaza f pentru toti copiii, dar sunt construiti si inserati
+    in frontiera doar cei cu f egal cu valoarea F retinuta in nod. Nodul este reinserat in frontiera
+    cu F = cel mai mic f al copiilor ramasi, daca exista. Copiii cu f mare, care de obicei nu ajung
+    sa fie expandati, nu sunt construiti niciodata.
 
-        graf.reset()
-
-        # print(graf.start.to_string())
-
-        # print('==========================DFI==========================')
-        f.write('\n==========================DFI==========================\n')
-        with stopit.ThreadingTimeout(int(sys.argv[4])) as to_ctx_mgr:
-            assert to_ctx_mgr.state == to_ctx_mgr.EXECUTING
-            depth_first_iterativ(graf, int(sys.argv[3]), f)
-
-        # print(graf.start.to_string())
-
-        graf.reset()
-
-        # print(graf.start.to_string())
-
-        # print('==========================UCS==========================')
-        f.write('\n==========================UCS==========================\n')
-        with stopit.ThreadingTimeout(int(sys.argv[4])) as to_ctx_mgr:
-            assert to_ctx_mgr.state == to_ctx_mgr.EXECUTING
-            uniform_cost_search(graf, int(sys.argv[3]), f)
-
-        # print(graf.start.to_string())
-
-        graf.reset()
-
-        # print(graf.start.to_string())
+    Args:
+        graf: Graful pe care sa se faca parcurgerea.
+        numar_solutii: Numarul de solutii care sa fie cautate.
+        f: Fisierul in care sa fie scrise solutiile.
+        euristica: Euristica de folosit pentru calcularea lui h(nod). Poate fi 'euristica_banala',
+            'euristica_admisibila_1', 'euristica_admisibila_2', 'euristica_neadmisibila'.
+    '''
+    start_time = time.time()
+    nod = NodParcurgere(graf.start, None)
+    nod.h = nod.calculeaza_h(nod.state, euristica)
+    nod.f = nod.h
+    frontier = AstarMinHeap()
+    # map: str(state) -> node, pentru nodurile scoase cel putin o data din frontiera
+    expanded = {}
+    frontier.insert(nod)
 
-        # print('========================== A* (naiv) - euristica banala ==========================')
-        f.write('\n========================== A* (naiv) - euristica banala ==========================\n')
-        with stopit.ThreadingTimeout(int(sys.argv[4])) as to_ctx_mgr:
-            assert to_ctx_mgr.state == to_ctx_mgr.EXECUTING
-            a_star_naiv(graf, int(sys.argv[3]), f)
+    while not frontier.is_empty():
+        nod = frontier.extract_min()
+        nod.retine_starea()
+        cheie = str(nod.state)
+        prima_expandare = cheie not in expanded
+        if prima_expandare:
+            if nod.is_end_state():
+                nod.afisare_drum(f, start_time)
+                numar_solutii -= 1
+                if numar_solutii <= 0:
+                    return
+            expanded[cheie] = nod
+
+        # la prima expandare sunt inserati si copiii cu f < F (euristici inconsistente),
+        # apoi doar cei cu f == F, ceilalti avand f mai mic au fost deja inserati
+        urmatorul_f = None
+        numar_succesori = 0
+        for sursa, destinatie, cost, h in nod.evalueaza_mutari(euristica):
+            f_copil = nod.g + cost + h
+            if f_copil == nod.f or (prima_expandare and f_copil < nod.f):
+                successor = nod.creeaza_succesor(sursa, destinatie, cost, h)
+                numar_succesori += 1
+                cheie_succesor = str(successor.state)
+                if not cheie_succesor in expanded:
+                    frontier.insert(successor, stare=cheie_succesor)
+                elif successor.g < expanded[cheie_succesor].g:
+                    # modific drumul daca a fost gasit ceva mai bun
+                    expanded[cheie_succesor].g = successor.g
+                    expanded[cheie_succesor].parinte = successor.parinte
+                    expanded[cheie_succesor].mutare = successor.mutare
+            elif f_copil > nod.f and (urmatorul_f is None or f_copil < urmatorul_f):
+                urmatorul_f = f_copil
+        graf.inregistreaza_expandare(numar_succesori)
+
+        if urmatorul_f is not None:
+            nod.f = urmatorul_f
+            frontier.insert(nod, stare=cheie)
+        nod.elibereaza_starea()
+
+
+def a_star_inconsistent(graf: Graf, numar_solutii: int, f: TextIO = None,
+        euristica: str = 'euristica_neadmisibila', max_redeschideri: Optional[int] = None,
+        bpmx: bool = True):
+    '''Implementare A* pentru euristici inconsistente.
+    Cand se gaseste un drum mai scurt catre o stare deja expandata, starea este redeschisa
+    (reinserata in frontiera cu noul g), ca drumul mai bun sa ajunga si la descendentii ei.
+    Dupa max_redeschideri redeschideri ale unei stari, este modificat doar nodul expandat, ca in a_star.
+
+    Cu bpmx, valorile h sunt propagate intre parinte si copii (pathmax bidirectional, BPMX).
+    Mutarile sunt reversibile si au acelasi cost in ambele sensuri, deci
+    h(parinte) >= h(copil) - cost si h(copil) >= h(parinte) - cost.
+    Stari expandate de mai multe ori sunt numarate in graf.numar_reexpandari.
 
-        # print(graf.start.to_string())
+    Args:
+        graf: Graful pe care sa se faca parcurgerea.
+        numar_solutii: Numarul de solutii care sa fie cautate.
+        f: Fisierul in care sa fie scrise solutiile.
+        euristica: Euristica de folosit pentru calcularea lui h(nod). Poate fi 'euristica_banala',
+            'euristica_admisibila_1', 'euristica_admisibila_2', 'euristica_neadmisibila'.
+        max_redeschideri: Numarul maxim de redeschideri ale unei stari. None - nelimitat, 0 - niciodata.
+        bpmx: Daca valorile h sunt propagate intre parinte si copii.
+    '''
+    start_time = time.time()
+    nod = NodParcurgere(graf.start, None)
+    nod.h = nod.calculeaza_h(nod.state, euristica)
+    nod.f = nod.h
+    frontier = AstarMinHeap()
+    # map: str(state) -> node
+    expanded = {}
+    # map: str(state) -> numarul de redeschideri ale starii
+    redeschideri = {}
+    frontier.insert(nod)
 
-        graf.reset()
+    while not frontier.is_empty():
+        nod = frontier.extract_min()
+        nod.retine_starea()
+        if nod.is_end_state():
+            nod.afisare_drum(f, start_time)
+            numar_solutii -= 1
+            if numar_solutii <= 0:
+                return
+        graf.inregistreaza_reexpandare(nod.state)
+        expanded[str(nod.state)] = nod
+
+        mutari = list(nod.evalueaza_mutari(euristica))
+        if bpmx and len(mutari) > 0:
+            nod.h = max(nod.h, max([h - cost for sursa, destinatie, cost, h in mutari]))
+            nod.f = nod.g + nod.h
+            mutari = [(sursa, destinatie, cost, max(h, nod.h - cost))
+                for sursa, destinatie, cost, h in mutari]
+        graf.inregistreaza_expandare(len(mutari))
+
+        for sursa, destinatie, cost, h in mutari:
+            successor = nod.creeaza_succesor(sursa, destinatie, cost, h)
+            cheie = str(successor.state)
+            if not cheie in expanded:
+                frontier.insert(successor, stare=cheie)
+            elif successor.g < expanded[cheie].g:
+                if max_redeschideri is None or redeschideri.get(cheie, 0) < max_redeschideri:
+                    # redeschid starea
+                    redeschideri[cheie] = redeschideri.get(cheie, 0) + 1
+                    del expanded[cheie]
+                    frontier.insert(successor, stare=cheie)
+                else:
+                    # modific drumul, fara sa il propag la descendenti
+                    expanded[cheie].f = successor.f
+                    expanded[cheie].g = successor.g
+                    expanded[cheie].parinte = successor.parinte
+                    expanded[cheie].mutare = successor.mutare
+        nod.elibereaza_starea()
+
+
+def beam_search(graf: Graf, numar_solutii: int, f: TextIO = None, euristica: str = 'euristica_admisibila_2',
+        latime: int = 100, criteriu: str = 'h', latime_maxima: Optional[int] = None):
+    '''Implementare beam search. Parcurgerea se face pe straturi, ca BFS, dar din fiecare strat
+    sunt pastrate doar cele mai bune latime noduri. Memoria folosita este O(latime * adancime).
+    Cautarea nu este completa: poate sa nu gaseasca solutii care exista.
 
-        # print(graf.start.to_string())
+    Args:
+        graf: Graful pe care sa se faca parcurgerea.
+        numar_solutii: Numarul de solutii care sa fie cautate.
+        f: Fisierul in care sa fie scrise solutiile.
+        euristica: Euristica de folosit pentru calcularea lui h(nod). Poate fi 'euristica_banala',
+            'euristica_admisibila_1', 'euristica_admisibila_2', 'euristica_neadmisibila'.
+        latime: Numarul maxim de noduri pastrate din fiecare strat.
+        criteriu: 'h' pentru a ordona nodurile dupa h(nod), 'f' pentru a le ordona dupa g(nod)+h(nod).
+        latime_maxima: Daca este data si un strat ramane gol fara sa fi fost gasita vreo solutie,
+            cautarea este reluata cu latimea dublata, pana la latime_maxima.
+    '''
+    start_time = time.time()
+    while True:
+        ramase = strat_beam(graf, numar_solutii, f, euristica, latime, criteriu, start_time)
+        if ramase < numar_solutii or latime_maxima is None or latime >= latime_maxima:
+            return
+        latime = min(2 * latime, latime_maxima)
+        graf.reset(statistici=False)
 
-        # print('========================== A* (naiv) - euristica admisibila 1 ==========================')
-        f.write('\n========================== A* (naiv) - euristica admisibila 1 ==========================\n')
-        with stopit.ThreadingTimeout(int(sys.argv[4])) as to_ctx_mgr:
-            assert to_ctx_mgr.state == to_ctx_mgr.EXECUTING
-            a_star_naiv(graf, int(sys.argv[3]), f, 'euristica_admisibila_1')
 
-        # print(graf.start.to_string())
+def strat_beam(graf: Graf, numar_solutii: int, f: TextIO, euristica: str, latime: int, criteriu: str,
+        start_time: float) -> int:
+    '''O parcurgere beam search cu latime fixa.
 
-        graf.reset()
+    Args:
+        graf: Graful pe care sa se faca parcurgerea. graf.discovered retine starile puse in beam.
+        numar_solutii: Numarul de solutii care sa fie cautate.
+        f: Fisierul in care sa fie scrise solutiile.
+        euristica: Euristica folosita pentru ordonarea nodurilor.
+        latime: Numarul maxim de noduri pastrate din fiecare strat.
+        criteriu: 'h' sau 'f'.
+        start_time: Timpul la care a inceput cautarea.
 
-        # print(graf.start.to_string())
+    Returns:
+        Numarul de solutii ramase de cautat.
+    '''
+    nod = NodParcurgere(graf.start, None)
+    nod.h = nod.calculeaza_h(nod.state, euristica)
+    nod.f = nod.h
+    strat = [nod]
+    graf.set_discovered(graf.start)
 
-        # print('========================== A* (naiv) - euristica admisibila 2 ==========================')
-        f.write('\n========================== A* (naiv) - euristica admisibila 2 ==========================\n')
-        with stopit.ThreadingTimeout(int(sys.argv[4])) as to_ctx_mgr:
-            assert to_ctx_mgr.state == to_ctx_mgr.EXECUTING
-            a_star_naiv(graf, int(sys.argv[3]), f, 'euristica_admisibila_2')
+    while len(strat) > 0:
+        for nod in strat:
+            if nod.is_end_state():
+                nod.afisare_drum(f, start_time)
+                numar_solutii -= 1
+                if numar_solutii <= 0:
+                    return numar_solutii
+
+        # map: str(state) -> cel mai bun candidat pentru starea respectiva din stratul urmator
+        candidati = {}
+        for nod in strat:
+            toti_succesorii = nod.generate_successors(euristica)
+            graf.inregistreaza_expandare(len(toti_succesorii))
+            for successor in toti_succesorii:
+                cheie = str(successor.state)
+                if cheie in graf.discovered:
+                    continue
+                if cheie not in candidati or successor.g < candidati[cheie].g:
+                    candidati[cheie] = successor
+
+        if criteriu == 'f':
+            valoare = lambda nod: (nod.f, nod.g)
+        else:
+            valoare = lambda nod: (nod.h, nod.g)
+        strat_anterior = strat
+        strat = heapq.nsmallest(latime, candidati.values(), key=valoare)
+        # nodurile pastrate isi retin starea pana la expandare, parintii nu mai au nevoie de ea
+        for nod in strat:
+            nod.retine_starea()
+            graf.set_discovered(nod.state)
+        for nod in strat_anterior:
+            nod.elibereaza_starea()
 
-        # print(graf.start.to_string())
+    return numar_solutii
 
-        graf.reset()
 
-        # print(graf.start.to_string())
+def greedy_best_first(graf: Graf, numar_solutii: int, f: TextIO = None,
+        euristica: str = 'euristica_admisibila_2', mutari_preferate: bool = False):
+    '''Implementare greedy best-first search cu evaluare amanata a euristicii.
+    Mutarile unui nod expandat sunt puse in coada cu h-ul nodului, fara sa fie construiti succesorii.
+    Starea succesorului si h-ul lui sunt calculate doar cand mutarea este scoasa din coada, deci
+    succesorii care nu ajung sa fie scosi nu costa nimic. Starile apar o singura data in parcurgere.
+    Cautarea urmareste gasirea rapida a unui drum, nu a celui mai ieftin.
 
-        # print('========================== A* (naiv) - euristica neadmisibila ==========================')
-        f.write('\n========================== A* (naiv) - euristica neadmisiblia ==========================\n')
-        with stopit.ThreadingTimeout(int(sys.argv[4])) as to_ctx_mgr:
-            assert to_ctx_mgr.state == to_ctx_mgr.EXECUTING
-            a_star_naiv(graf, int(sys.argv[3]), f, 'euristica_neadmisibila')
+    Cu mutari_preferate, mutarile care iau un bloc de pe o stiva cu H > n+1 sunt puse si intr-o
+    a doua coada, iar cele doua cozi sunt folosite alternativ. Mutarile preferate nu au prioritate
+    stricta: ele sunt scoase la fiecare a doua extragere, iar celelalte extrageri sunt facute din
+    coada cu toate mutarile (o mutare preferata poate fi scoasa si de acolo).
 
-        # print(graf.start.to_string())
+    Args:
+        graf: Graful pe care sa se faca parcurgerea. graf.discovered retine starile evaluate.
+        numar_solutii: Numarul de solutii care sa fie cautate.
+        f: Fisierul in care sa fie scrise solutiile.
+        euristica: Euristica de folosit pentru calcularea lui h(nod). Poate fi 'euristica_banala',
+            'euristica_admisibila_1', 'euristica_admisibila_2', 'euristica_neadmisibila'.
+        mutari_preferate: Daca mutarile care scad o stiva prea inalta sunt puse si intr-o a doua coada,
+            folosita alternativ cu prima.
+    '''
+    start_time = time.time()
+    n = sum([stiva.get_height() for stiva in graf.start.s]) // len(graf.start.s)
+    # intrari (h_parinte, ordine, parinte, sursa, destinatie, cost)
+    cozi = [[]] if not mutari_preferate else [[], []]
+    ordine = 0
+    coada_curenta = 0
 
-        graf.reset()
+    nod = NodParcurgere(graf.start, None)
+    while True:
+        if not graf.is_discovered(nod.state):
+            graf.set_discovered(nod.state)
+            nod.h = nod.calculeaza_h(nod.state, euristica)
+            nod.f = nod.g + nod.h
+            if nod.is_end_state():
+                nod.afisare_drum(f, start_time)
+                numar_solutii -= 1
+                if numar_solutii <= 0:
+                    return
+
+            for sursa, destinatie, cost in nod.state.mutari_valide():
+                ordine += 1
+                intrare = (nod.h, ordine, nod, sursa, destinatie, cost)
+                heapq.heappush(cozi[0], intrare)
+                if mutari_preferate and nod.state.s[sursa].get_height() > n+1:
+                    heapq.heappush(cozi[1], intrare)
+            # succesorii sunt numarati cand sunt construiti
+            graf.inregistreaza_expandare(0)
+
+        # alternez cozile, sarind peste cele goale
+        nevide = [coada for coada in cozi if len(coada) > 0]
+        if len(nevide) == 0:
+            return
+        coada_curenta = (coada_curenta + 1) % len(cozi)
+        coada = cozi[coada_curenta] if len(cozi[coada_curenta]) > 0 else nevide[0]
+        h_parinte, ordine_intrare, parinte, sursa, destinatie, cost = heapq.heappop(coada)
+        nod = parinte.creeaza_succesor(sursa, destinatie, cost, h_parinte)
+        nod.retine_starea()
+        graf.numar_generari += 1
+
+
+def explorare_exhaustiva(graf: Graf, numar_solutii: int, f: TextIO = None,
+        cale_bitmap: Optional[str] = None, max_stari: int = MAX_STARI_EXPLORARE):
+    '''BFS care foloseste ca set de stari vizitate un bitmap indexat dupa rangul starilor
+    (vezi rang_stari.py), cu 2 biti pe stare, si o frontiera de intregi. Daca nu exista solutii,
+    parcurgerea demonstreaza acest lucru explorand toate starile accesibile.
 
-        # print(graf.start.to_string())
+    Args:
+        graf: Graful pe care sa se faca parcurgerea.
+        numar_solutii: Numarul de solutii care sa fie cautate.
+        f: Fisierul in care sa fie scrise solutiile.
+        cale_bitmap: Fisierul in care este mapat bitmap-ul. Daca este None, bitmap-ul este tinut in memorie.
+        max_stari: Numarul maxim de stari (accesibile sau nu) pentru care se face explorarea.
+    '''
+    start_time = time.time()
+    try:
+        rang_stari = RangStari(graf.start)
+    except ValueError as e:
+        f.write('Explorarea exhaustiva nu se aplica: %s\n'%(e))
+        return
+    if rang_stari.numar_stari > max_stari:
+        f.write('Spatiul starilor este prea mare pentru explorarea exhaustiva (%d stari).\n'%(
+            rang_stari.numar_stari))
+        return
+
+    vizitate = BitmapStari(rang_stari.numar_stari, 2, cale_bitmap)
+    try:
+        solutii_gasite = 0
+        for rang, state, adancime in parcurgere_ranguri(rang_stari, graf.start, vizitate):
+            graf.inregistreaza_expandare(0)
+            if not state.is_end_state():
+                continue
+            nod = NodParcurgere(graf.start, None)
+            for sursa, destinatie in drum_catre(rang_stari, vizitate, rang, adancime):
+                cost = nod.state.s[sursa][-1].greutate
+                nod = nod.creeaza_succesor(sursa, destinatie, cost, 0)
+            nod.afisare_drum(f, start_time)
+            solutii_gasite += 1
+            if solutii_gasite >= numar_solutii:
+                return
+        if solutii_gasite == 0:
+            f.write('Nu exista solutii (stari accesibile explorate: %d).\n'%(
+                graf.numar_expandari))
+    finally:
+        vizitate.inchide()
+
+
+# (titlu, algoritm, euristica) pentru fiecare cautare rulata pe o instanta
+CAUTARI = [
+    ('==========================BFS==========================', breadth_first_search, None),
+    ('==========================DFS==========================', depth_first_search, None),
+    ('==========================DFI==========================', depth_first_iterativ, None),
+    ('==========================UCS==========================', uniform_cost_search, None),
+    ('========================== A* (naiv) - euristica banala ==========================',
+        a_star_naiv, 'euristica_banala'),
+    ('========================== A* (naiv) - euristica admisibila 1 ==========================',
+        a_star_naiv, 'euristica_admisibila_1'),
+    ('========================== A* (naiv) - euristica admisibila 2 ==========================',
+        a_star_naiv, 'euristica_admisibila_2'),
+    ('========================== A* (naiv) - euristica neadmisiblia ==========================',
+        a_star_naiv, 'euristica_neadmisibila'),
+    ('========================== A* (optimizat) - euristica banala ==========================',
+        a_star, 'euristica_banala'),
+    ('========================== A* (optimizat) - euristica admisibila 1 ==========================',
+        a_star, 'euristica_admisibila_1'),
+    ('========================== A* (optimizat) - euristica admisibila 2 ==========================',
+        a_star, 'euristica_admisibila_2'),
+    ('========================== A* (optimizat) - euristica neadmisibila ==========================',
+        a_star, 'euristica_neadmisibila'),
+    ('========================== A* (expandare partiala) - euristica admisibila 2 ==========================',
+        a_star_partial, 'euristica_admisibila_2'),
+    ('========================== A* (euristici inconsistente, BPMX) - euristica neadmisibila ==========================',
+        a_star_inconsistent, 'euristica_neadmisibila'),
+    ('========================== Beam search - euristica admisibila 2 ==========================',
+        beam_search, 'euristica_admisibila_2'),
+    ('========================== Greedy best-first (evaluare amanata) - euristica admisibila 2 ==========================',
+        greedy_best_first, 'euristica_admisibila_2'),
+    ('========================== Explorare exhaustiva (BFS pe ranguri) ==========================',
+        explorare_exhaustiva, None),
+]
+
+TITLU_ANALIZA = '==========================Analiza statica=========================='
+
+# algoritmii care pot fi salvati si reluati (vezi checkpoint.py)
+CAUTARI_CU_CHECKPOINT = {breadth_first_search, uniform_cost_search, a_star}
+# algoritmii a caror frontiera foloseste politica de departajare (vezi priority_queues.py)
+CAUTARI_CU_DEPARTAJARE = {uniform_cost_search, a_star_naiv, a_star, a_star_partial, a_star_inconsistent}
+# optiunile algoritmilor care nu le schimba rezultatele (nu intra in numele din cache si checkpoint)
+OPTIUNI_FARA_EFECT = {'cale_bitmap'}
+# fractiunea din timeout dupa care o cautare cu checkpoint este salvata si oprita,
+# inainte ca stopit sa o intrerupa
+TERMEN_CHECKPOINT = 0.9
+
+
+def nume_algoritm(algoritm, optiuni: Optional[Dict] = None) -> str:
+    '''Numele sub care sunt salvate rezultatele unui algoritm (cache, checkpoint).
+    Contine politica de departajare, daca aceasta influenteaza algoritmul si nu este cea implicita,
+    si optiunile date algoritmului, in afara de cele din OPTIUNI_FARA_EFECT.'''
+    nume = algoritm.__name__
+    if algoritm in CAUTARI_CU_DEPARTAJARE:
+        departajare = str(AstarMinHeap().departajare)
+        if departajare != 'lexicografic':
+            nume += '/' + departajare
+    for optiune, valoare in sorted((optiuni or {}).items()):
+        if optiune not in OPTIUNI_FARA_EFECT:
+            nume += '/%s=%s'%(optiune, valoare)
+    return nume
+
+
+def ruleaza_cautare(graf: Graf, algoritm, euristica: Optional[str], numar_solutii: int, timeout: int,
+        f: TextIO, cache: Optional[CacheSolutii] = None, folder_checkpoint: Optional[str] = None,
+        optiuni: Optional[Dict] = None) -> None:
+    '''Ruleaza o cautare cu timeout, folosind cache-ul de solutii daca acesta exista.
+    Cautarile din CAUTARI_CU_CHECKPOINT sunt salvate in folder_checkpoint daca acesta este dat
+    si reluate de acolo la urmatoarea rulare.
 
-        # print('========================== A* (optimizat) - euristica banala ==========================')
-        f.write('\n========================== A* (optimizat) - euristica banala ==========================\n')
-        with stopit.ThreadingTimeout(int(sys.argv[4])) as to_ctx_mgr:
-            assert to_ctx_mgr.state == to_ctx_mgr.EXECUTING
-            a_star(graf, int(sys.argv[3]), f)
+    Args:
+        graf: Graful pe care sa se faca parcurgerea.
+        algoritm: Functia de cautare.
+        euristica: Euristica data algoritmului sau None pentru cautarile neinformate.
+        numar_solutii: Numarul de solutii care sa fie cautate.
+        timeout: Timpul maxim, in secunde.
+        f: Fisierul in care sa fie scrise solutiile.
+        cache: Cache-ul de solutii. Daca este None, cautarea este mereu rulata.
+        folder_checkpoint: Folderul in care sunt pastrate checkpoint-urile.
+        optiuni: Argumentele suplimentare ale algoritmului (ex: latime pentru beam_search).
+    '''
+    instanta = cheie_instanta(graf.start)
+    nume = nume_algoritm(algoritm, optiuni)
+    if cache is not None:
+        intrare = cache.cauta(instanta, nume, euristica or '', numar_solutii, timeout)
+        if intrare is not None:
+            reda_solutii(intrare, graf.start, f)
+            graf.numar_expandari = intrare['numar_expandari']
+            graf.numar_generari = intrare['numar_generari']
+            graf.numar_reexpandari = intrare['numar_reexpandari']
+            return
+        f = JurnalSolutii(f)
 
-        # print(graf.start.to_string())
+    start_time = time.time()
+    argumente = dict(optiuni or {})
+    cale_checkpoint = None
+    if folder_checkpoint is not None and algoritm in CAUTARI_CU_CHECKPOINT:
+        cale_checkpoint = os.path.join(folder_checkpoint,
+            '%s_%s_%s.ckpt'%(instanta[:16], nume.replace('/', '_').replace(':', '_'), euristica or ''))
+        argumente['checkpoint'] = cale_checkpoint
+        argumente['termen'] = start_time + TERMEN_CHECKPOINT * timeout
+
+    with stopit.ThreadingTimeout(timeout) as to_ctx_mgr:
+        assert to_ctx_mgr.state == to_ctx_mgr.EXECUTING
+        if euristica is None:
+            algoritm(graf, numar_solutii, f, **argumente)
+        else:
+            algoritm(graf, numar_solutii, f, euristica, **argumente)
+
+    if cache is not None:
+        # o cautare oprita la termen isi lasa checkpoint-ul pentru reluare
+        if to_ctx_mgr.state == to_ctx_mgr.TIMED_OUT or (
+                cale_checkpoint is not None and os.path.exists(cale_checkpoint)):
+            status = STATUS_TIMEOUT
+        elif f.numar_solutii() >= numar_solutii:
+            status = STATUS_REZOLVAT
+        else:
+            status = STATUS_EPUIZAT
+        cache.salveaza(instanta, nume, euristica or '', numar_solutii, timeout,
+            status, f, graf, time.time() - start_time)
 
-        graf.reset()
 
-        # print(graf.start.to_string())
+if __name__ == "__main__":
+    # input folder, output folder, NSOL, timeout
+    parser = argparse.ArgumentParser()
+    parser.add_argument('input_folder')
+    parser.add_argument('output_folder')
+    parser.add_argument('NSOL', type=int)
+    parser.add_argument('timeout', type=int)
+    parser.add_argument('--backend', choices=['python', 'numpy'], default='python',
+        help='Backend-ul folosit pentru generarea succesorilor si calculul euristicilor.')
+    parser.add_argument('--cache', default=None,
+        help='Fisierul SQLite in care sunt pastrate solutiile intre rulari.')
+    parser.add_argument('--checkpoint', default=None,
+        help='Folderul in care BFS, UCS si A* sunt salvate periodic si din care sunt reluate.')
+    parser.add_argument('--departajare', choices=POLITICI_DEPARTAJARE, default='lexicografic',
+        help='Ordinea nodurilor cu aceeasi prioritate in frontiera pentru UCS si A*.')
+    parser.add_argument('--seed', type=int, default=0,
+        help='Seed-ul pentru --departajare aleator.')
+    parser.add_argument('--fara-analiza', action='store_true',
+        help='Ruleaza cautarile si pentru instantele rezolvate de analiza statica.')
+    parser.add_argument('--statistici', action='store_true',
+        help='Afiseaza numarul de noduri expandate, generate si reexpandate de fiecare cautare.')
+    parser.add_argument('--latime-beam', type=int, default=None,
+        help='Numarul de noduri pastrate din fiecare strat in beam search (implicit 100).')
+    parser.add_argument('--criteriu-beam', choices=['h', 'f'], default=None,
+        help='Ordonarea nodurilor in beam search: dupa h (implicit) sau dupa g+h.')
+    parser.add_argument('--latime-maxima-beam', type=int, default=None,
+        help='Daca beam search nu gaseste solutii, este reluat cu latimea dublata, pana la aceasta latime.')
+    parser.add_argument('--mutari-preferate', action='store_true',
+        help='Greedy best-first alterneaza intre toate mutarile si cele care scad o stiva prea inalta.')
+    parser.add_argument('--max-stari-explorare', type=int, default=None,
+        help='Numarul maxim de stari pentru explorarea exhaustiva (implicit %d).'%(MAX_STARI_EXPLORARE))
+    parser.add_argument('--bitmap-explorare', default=None,
+        help='Fisierul in care este mapat bitmap-ul explorarii exhaustive (implicit, in memorie).')
+    args = parser.parse_args()
+    for latime in (args.latime_beam, args.latime_maxima_beam):
+        if latime is not None and latime < 1:
+            parser.error('Latimea beam search trebuie sa fie cel putin 1.')
+
+    if not os.path.exists(args.input_folder):
+        print('Input folder \'%s\' does not exist.'%(args.input_folder))
+        sys.exit(1)
+    if not os.path.exists(args.output_folder):
+        print('Output folder \'%s\' does not exist.'%(args.output_folder))
+        sys.exit(1)
 
-        # print('========================== A* (optimizat) - euristica admisibila 1 ==========================')
-        f.write('\n========================== A* (optimizat) - euristica admisibila 1 ==========================\n')
-        with stopit.ThreadingTimeout(int(sys.argv[4])) as to_ctx_mgr:
-            assert to_ctx_mgr.state == to_ctx_mgr.EXECUTING
-            a_star(graf, int(sys.argv[3]), f, 'euristica_admisibila_1')
+    if args.backend == 'numpy' and not numpy_backend.numpy_disponibil():
+        print('Backend-ul numpy necesita pachetul numpy.')
+        sys.exit(1)
+    NodParcurgere.backend = args.backend
+
+    # argumentele date explicit algoritmilor; cele lipsa raman la valorile implicite
+    optiuni = {
+        beam_search: {'latime': args.latime_beam, 'criteriu': args.criteriu_beam,
+            'latime_maxima': args.latime_maxima_beam},
+        greedy_best_first: {'mutari_preferate': args.mutari_preferate or None},
+        explorare_exhaustiva: {'max_stari': args.max_stari_explorare, 'cale_bitmap': args.bitmap_explorare},
+    }
+    for algoritm in optiuni:
+        optiuni[algoritm] = {optiune: valoare for optiune, valoare in optiuni[algoritm].items()
+            if valoare is not None}
+    for heap in (MinHeap, AstarMinHeap):
+        heap.politica_departajare = args.departajare
+        heap.seed = args.seed
+
+    cache = None
+    if args.cache is not None:
+        cache = CacheSolutii(args.cache)
+    if args.checkpoint is not None and not os.path.exists(args.checkpoint):
+        os.makedirs(args.checkpoint)
+
+    fisiere_input = os.listdir(args.input_folder)
+    print(fisiere_input)
+    fisiere_output = os.listdir(args.output_folder)
 
-        graf.reset()
+    for fisier_input, fisier_output in zip(fisiere_input, fisiere_output):
+        # print('Solutii pentru ', fisier_input)
+        # print()
+        start = State(args.input_folder + '/' + fisier_input)
+        graf = Graf(start)
 
-        # print('========================== A* (optimizat) - euristica admisibila 2 ==========================')
-        f.write('\n========================== A* (optimizat) - euristica admisibila 2 ==========================\n')
-        with stopit.ThreadingTimeout(int(sys.argv[4])) as to_ctx_mgr:
-            assert to_ctx_mgr.state == to_ctx_mgr.EXECUTING
-            a_star(graf, int(sys.argv[3]), f, 'euristica_admisibila_2')
+        if not start.is_valid():
+            print('Initial state is invalid.')
+            sys.exit(1)
 
-        graf.reset()
+        f = open(args.output_folder + '/' + fisier_output, 'w')
+        f.truncate()
 
-        # print('========================== A* (optimizat) - euristica neadmisibila ==========================')
-        f.write('\n========================== A* (optimizat) - euristica neadmisibila ==========================\n')
-        with stopit.ThreadingTimeout(int(sys.argv[4])) as to_ctx_mgr:
-            assert to_ctx_mgr.state == to_ctx_mgr.EXECUTING
-            a_star(graf, int(sys.argv[3]), f, 'euristica_neadmisibila')
+        # instantele deja rezolvate sau fara solutii nu mai sunt cautate
+        if not args.fara_analiza:
+            start_time = time.time()
+            rezultat = analizeaza(start)
+            if rezultat is not None:
+                f.write('\n' + TITLU_ANALIZA + '\n')
+                scrie_verdict(rezultat, start, f, start_time)
+                f.close()
+                continue
+
+        for titlu, algoritm, euristica in CAUTARI:
+            f.write('\n' + titlu + '\n')
+            if optiuni.get(algoritm):
+                f.write('Optiuni: ' + ', '.join(['%s = %s'%(optiune, valoare)
+                    for optiune, valoare in sorted(optiuni[algoritm].items())]) + '\n')
+            ruleaza_cautare(graf, algoritm, euristica, args.NSOL, args.timeout, f, cache, args.checkpoint,
+                optiuni.get(algoritm))
+            if args.statistici:
+                print('%s: %s - expandari: %d, generari: %d, reexpandari: %d'%(fisier_input, titlu.strip('= '),
+                    graf.numar_expandari, graf.numar_generari, graf.numar_reexpandari))
+            graf.reset()
 
         f.close()
+
+    if cache is not None:
+        cache.inchide()
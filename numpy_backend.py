@@ -0,0 +1,178 @@
+from typing import Iterable, List, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from state_representation import *
+
+
+def numpy_disponibil() -> bool:
+    '''Verifica daca NumPy este instalat.'''
+    return np is not None
+
+
+class StareVectorizata:
+    '''Reprezentarea unei stari sub forma de vectori NumPy.
+
+    Attributes:
+        inaltimi: Vector (k,) cu numarul de blocuri din fiecare stiva.
+        greutati: Matrice (k, L) cu greutatile blocurilor, completata cu 0 peste varful stivelor.
+        greutati_varf: Vector (k,) cu greutatea blocului din varful fiecarei stive (0 daca stiva e goala).
+        capacitati: Vector (k,) cu greutatea maxima care mai poate fi pusa pe fiecare stiva.
+            Pentru o stiva goala capacitatea este mai mare decat greutatea oricarui bloc.
+    '''
+    def __init__(self, state: State, latime: int = 0):
+        '''
+        Args:
+            state: Starea care trebuie convertita.
+            latime: Numarul minim de coloane al matricei de greutati.
+        '''
+        if np is None:
+            raise ImportError('Backend-ul numpy necesita pachetul numpy.')
+        k = len(state.s)
+        self.inaltimi = np.array([stiva.get_height() for stiva in state.s], dtype=np.int64)
+        latime = max(latime, int(self.inaltimi.max(initial=0)) + 1)
+        self.greutati = np.zeros((k, latime), dtype=np.int64)
+        rezistente = np.zeros((k, latime), dtype=np.int64)
+        for i, stiva in enumerate(state.s):
+            for j, bloc in enumerate(stiva.s):
+                self.greutati[i, j] = bloc.greutate
+                rezistente[i, j] = bloc.rezistenta
+
+        # orice bloc incape pe o pozitie goala
+        infinit = int(self.greutati.sum()) + 1
+        pozitii_goale = np.arange(latime)[None, :] >= self.inaltimi[:, None]
+        rezistente[pozitii_goale] = infinit
+
+        # greutatea de deasupra fiecarei pozitii
+        deasupra = np.cumsum(self.greutati[:, ::-1], axis=1)[:, ::-1] - self.greutati
+        self.capacitati = (rezistente - deasupra).min(axis=1)
+
+        self.greutati_varf = np.zeros(k, dtype=np.int64)
+        nevide = self.inaltimi > 0
+        self.greutati_varf[nevide] = self.greutati[nevide, self.inaltimi[nevide] - 1]
+
+    def masca_mutari(self) -> 'np.ndarray':
+        '''Calculeaza matricea (k, k) a mutarilor valide: masca[i, j] este True daca blocul
+        din varful stivei i poate fi pus pe stiva j.'''
+        k = len(self.inaltimi)
+        return (
+            (self.inaltimi > 0)[:, None] &
+            (self.greutati_varf[:, None] <= self.capacitati[None, :]) &
+            ~np.eye(k, dtype=bool)
+        )
+
+    def succesori(self) -> Tuple['np.ndarray', 'np.ndarray', 'np.ndarray', 'np.ndarray']:
+        '''Aplica toate mutarile valide simultan.
+
+        Mutarile sunt in aceeasi ordine ca in State.mutari_valide().
+
+        Returns:
+            Vectorii sursa si destinatie ai mutarilor, matricea (m, k) a inaltimilor
+            si tensorul (m, k, L) al greutatilor pentru cei m succesori.
+        '''
+        surse, destinatii = np.nonzero(self.masca_mutari())
+        m = len(surse)
+        randuri = np.arange(m)
+
+        inaltimi = np.repeat(self.inaltimi[None, :], m, axis=0)
+        # matricea are cel putin o coloana libera deasupra celei mai inalte stive
+        greutati = np.repeat(self.greutati[None, :, :], m, axis=0)
+
+        greutati[randuri, destinatii, inaltimi[randuri, destinatii]] = self.greutati_varf[surse]
+        greutati[randuri, surse, inaltimi[randuri, surse] - 1] = 0
+        inaltimi[randuri, surse] -= 1
+        inaltimi[randuri, destinatii] += 1
+
+        return surse, destinatii, inaltimi, greutati
+
+
+def calculeaza_h_vectorizat(inaltimi: 'np.ndarray', greutati: 'np.ndarray',
+        tip_euristica: str = 'euristica_banala') -> List[int]:
+    '''Calculeaza euristica pentru un lot de stari, cu acelasi rezultat ca NodParcurgere.calculeaza_h.
+
+    Args:
+        inaltimi: Matricea (m, k) a inaltimilor stivelor.
+        greutati: Tensorul (m, k, L) al greutatilor, completat cu 0.
+        tip_euristica: 'euristica_banala', 'euristica_admisibila_1', 'euristica_admisibila_2',
+            orice altceva este o euristica neadmisibila.
+    '''
+    if len(inaltimi) == 0:
+        return []
+    k = inaltimi.shape[1]
+    # numarul total de blocuri nu se schimba prin mutari
+    num_blocuri = int(inaltimi[0].sum())
+    n = num_blocuri // k
+    m = num_blocuri % k
+
+    if tip_euristica == 'euristica_banala':
+        finala = ((inaltimi >= n) & (inaltimi <= n+1)).all(axis=1)
+        return (~finala).astype(np.int64).tolist()
+    elif tip_euristica == 'euristica_admisibila_1':
+        blocuri_lipsa = np.maximum(0, n - inaltimi).sum(axis=1)
+        prea_inalte = inaltimi > n+1
+        cost = prea_inalte.sum(axis=1)
+        blocuri_lipsa -= np.where(prea_inalte, inaltimi - (n+1), 0).sum(axis=1)
+        cost += np.maximum(0, blocuri_lipsa - cost)
+        return cost.tolist()
+
+    if greutati.shape[2] < n+2:
+        greutati = np.pad(greutati, ((0, 0), (0, 0), (0, n+2 - greutati.shape[2])))
+    cost = greutati[:, :, n+1:].sum(axis=(1, 2))
+    border = inaltimi >= n+1
+    border_costs = greutati[:, :, n]
+    # cate blocuri de pe nivelul n trebuie mutate
+    extra = border.sum(axis=1) - m
+
+    if tip_euristica == 'euristica_admisibila_2':
+        infinit = int(border_costs.sum()) + 1
+        sortate = np.sort(np.where(border, border_costs, infinit), axis=1)
+        sume = np.concatenate(
+            (np.zeros((len(sortate), 1), dtype=np.int64), np.cumsum(sortate, axis=1)), axis=1)
+        cost += sume[np.arange(len(sume)), np.maximum(extra, 0)]
+    else:
+        # primele blocuri in ordinea stivelor, fara sortare
+        rang = np.cumsum(border, axis=1)
+        alese = border & (rang <= extra[:, None])
+        cost += np.where(alese, border_costs, 0).sum(axis=1)
+    return cost.tolist()
+
+
+def calculeaza_h_batch(states: Iterable[State], tip_euristica: str = 'euristica_banala') -> List[int]:
+    '''Calculeaza euristica pentru mai multe stari ale aceleiasi instante (ex: un strat din BFS).
+
+    Args:
+        states: Starile pentru care se calculeaza euristica.
+        tip_euristica: 'euristica_banala', 'euristica_admisibila_1', 'euristica_admisibila_2',
+            orice altceva este o euristica neadmisibila.
+    '''
+    states = list(states)
+    if len(states) == 0:
+        return []
+    latime = max([stiva.get_height() for state in states for stiva in state.s]) + 1
+    vectorizate = [StareVectorizata(state, latime) for state in states]
+    inaltimi = np.stack([v.inaltimi for v in vectorizate])
+    greutati = np.stack([v.greutati for v in vectorizate])
+    return calculeaza_h_vectorizat(inaltimi, greutati, tip_euristica)
+
+
+def genereaza_succesori(state: State, tip_euristica: str = 'euristica_banala'
+        ) -> Tuple[List[Tuple[int, int]], List[int], List[int]]:
+    '''Echivalentul vectorizat al State.mutari_valide(), care calculeaza si euristica
+    tuturor succesorilor intr-un singur lot.
+
+    Args:
+        state: Starea pentru care se genereaza succesorii.
+        tip_euristica: Euristica folosita pentru succesori.
+
+    Returns:
+        Mutarile (sursa, destinatie), costurile lor si valorile euristicii pentru starile
+        rezultate, in aceeasi ordine ca in State.mutari_valide().
+    '''
+    stare_v = StareVectorizata(state)
+    surse, destinatii, inaltimi, greutati = stare_v.succesori()
+    h = calculeaza_h_vectorizat(inaltimi, greutati, tip_euristica)
+    costs = stare_v.greutati_varf[surse].tolist()
+    return list(zip(surse.tolist(), destinatii.tolist())), costs, h
@@ -1,34 +1,60 @@
+from typing import Iterable, List, Optional
+import random
+
 from sbbst import sbbst
 
 from state_representation import *
 from graf import *
 
 
+# Politicile de departajare a nodurilor cu aceeasi prioritate (g pentru UCS, f pentru A*):
+# 'lexicografic' - dupa reprezentarea starilor sub forma de string (comportamentul initial)
+# 'g_mare' - intai nodurile cu g mai mare (deci cu h mai mic), apoi in ordinea inserarii.
+#     Are sens doar pentru A*: in UCS nodurile cu aceeasi prioritate au acelasi g, deci 'g_mare'
+#     se comporta exact ca 'fifo'.
+# 'lifo' - intai nodurile inserate ultimele
+# 'fifo' - intai nodurile inserate primele
+# 'aleator' - ordine aleatoare, determinata de seed
+# In afara de 'lexicografic', toate sunt chei intregi calculate o singura data, la inserare.
+POLITICI_DEPARTAJARE = ('lexicografic', 'g_mare', 'lifo', 'fifo', 'aleator')
+
+
 class MinHeapKey:
     '''Cheie utilizata in PQ-ul pentru UCS.
 
     Attributes:
         nod: Nodul reprezentat de cheie.
+        stare: Reprezentarea starii nodului sub forma de string (cheia din PQ.chei).
+        cheie: Tuplul dupa care se compara cheile, calculat la constructie.
     '''
-    def __init__(self, nod: NodParcurgere):
+    def __init__(self, nod: NodParcurgere, departajare: Optional[tuple] = None,
+            stare: Optional[str] = None):
         '''
         Args:
             nod: Nodul reprezentat de chieie.
+            departajare: Componentele folosite cand distantele sunt egale. Implicit,
+                reprezentarea starii sub forma de string.
+            stare: Reprezentarea starii nodului sub forma de string, daca este deja calculata.
         '''
         self.nod = nod
+        self.stare = str(nod.state) if stare is None else stare
+        if departajare is None:
+            departajare = (self.stare,)
+        self.cheie = (nod.g,) + departajare
     
     def __lt__(self, other):
         '''Cheile se compara dupa distanta nodurilor lor fata de origine. Daca distanta e egala,
-            se compara starile lexicografic, dupa reprezentarea lor sub forma de stringuri.'''
-        if self.nod.g == other.nod.g:
-            return str(self.nod.state) < str(other.nod.state)
-        return self.nod.g < other.nod.g
+            se compara componentele de departajare.'''
+        return self.cheie < other.cheie
+
+    def __gt__(self, other):
+        return self.cheie > other.cheie
     
     def __eq__(self, other):
-        return self.nod.g == other.nod.g and str(self.nod.state) == str(other.nod.state)
+        return self.cheie == other.cheie
 
     def __str__(self):
-        return str(self.nod.state)
+        return self.stare
 
 
 class AstarMinHeapKey:
@@ -36,46 +62,148 @@ class AstarMinHeapKey:
 
     Attributes:
         nod: Nodul reprezentat de cheie.
+        g: Distanta nodului fata de origine la momentul inserarii.
+        stare: Reprezentarea starii nodului sub forma de string (cheia din PQ.chei).
+        cheie: Tuplul dupa care se compara cheile, calculat la constructie.
     '''
-    def __init__(self, nod):
+    def __init__(self, nod, departajare: Optional[tuple] = None, stare: Optional[str] = None):
         '''
         Args:
             nod: Nodul reprezentat de chieie.
+            departajare: Componentele folosite cand valorile f sunt egale. Implicit,
+                reprezentarea starii sub forma de string.
+            stare: Reprezentarea starii nodului sub forma de string, daca este deja calculata.
         '''
         self.nod = nod
+        self.g = nod.g
+        self.stare = str(nod.state) if stare is None else stare
+        if departajare is None:
+            departajare = (self.stare,)
+        self.cheie = (nod.f,) + departajare
 
     def __lt__(self, other):
         '''Cheile se compara dupa distanta estimata a drumului de la origine la o stare finala,
             trecand prin nodul reprezentat de chieie. Daca distanta e egala, se compara
-            starile lexicografic, dupa reprezentarea lor sub forma de stringuri.'''
-        if self.nod.f == other.nod.f:
-            return str(self.nod.state) < str(other.nod.state)
-        return self.nod.f < other.nod.f
+            componentele de departajare.'''
+        return self.cheie < other.cheie
+
+    def __gt__(self, other):
+        return self.cheie > other.cheie
 
     def __eq__(self, other):
-        return self.nod.f == other.nod.f and str(self.nod.state) == str(other.nod.state)
+        return self.cheie == other.cheie
 
     def __str__(self):
-        return str(self.nod.state)
+        return self.stare
+
+
+class Departajare:
+    '''Calculeaza componentele de departajare ale cheilor unui PQ, dupa o politica.
+
+    Attributes:
+        politica: Una din POLITICI_DEPARTAJARE.
+        seed: Seed-ul pentru politica 'aleator'.
+        ordine: Numarul de inserari facute pana acum.
+    '''
+    def __init__(self, politica: str = 'lexicografic', seed: int = 0):
+        '''
+        Args:
+            politica: Una din POLITICI_DEPARTAJARE.
+            seed: Seed-ul pentru politica 'aleator'.
+        '''
+        if politica not in POLITICI_DEPARTAJARE:
+            raise ValueError('Politica de departajare necunoscuta: %s'%(politica))
+        self.politica = politica
+        self.seed = seed
+        self.ordine = 0
+        self.rng = random.Random(seed)
+
+    def __str__(self) -> str:
+        '''Descrierea politicii, folosita pentru a deosebi rezultatele salvate (cache, checkpoint).'''
+        if self.politica == 'aleator':
+            return '%s:%d'%(self.politica, self.seed)
+        return self.politica
+
+    def __call__(self, nod: NodParcurgere, stare: Optional[str] = None) -> tuple:
+        '''
+        Args:
+            nod: Nodul inserat.
+            stare: Reprezentarea starii nodului sub forma de string, daca este deja calculata.
+        '''
+        self.ordine += 1
+        if self.politica == 'lexicografic':
+            return (str(nod.state) if stare is None else stare,)
+        elif self.politica == 'g_mare':
+            return (-nod.g, self.ordine)
+        elif self.politica == 'lifo':
+            return (-self.ordine,)
+        elif self.politica == 'fifo':
+            return (self.ordine,)
+        return (self.rng.getrandbits(32), self.ordine)
+
+    def salveaza_starea(self) -> tuple:
+        '''Starea necesara pentru ca inserarile ulterioare sa primeasca aceleasi componente
+        de departajare dupa o reluare (vezi restaureaza_starea).'''
+        return (self.ordine, self.rng.getstate())
+
+    def restaureaza_starea(self, stare: tuple) -> None:
+        '''Revine la o stare intoarsa de salveaza_starea.'''
+        ordine, stare_rng = stare
+        self.ordine = ordine
+        self.rng.setstate(stare_rng)
+
+    def pentru_reinserare(self, noduri: List[NodParcurgere]) -> List[tuple]:
+        '''Componentele de departajare pentru nodurile unui PQ reinserate in alt PQ
+        (ex: la reluarea dintr-un checkpoint), care le pastreaza ordinea de extragere.
+
+        Args:
+            noduri: Nodurile, in ordinea in care ar fi fost extrase.
+        '''
+        if self.politica == 'lifo':
+            return [self(nod) for nod in reversed(noduri)][::-1]
+        elif self.politica == 'aleator':
+            # numere aleatoare noi, sortate, ca nodurile sa fie amestecate cu cele inserate ulterior
+            departajari = []
+            for valoare in sorted([self.rng.getrandbits(32) for nod in noduri]):
+                self.ordine += 1
+                departajari.append((valoare, self.ordine))
+            return departajari
+        return [self(nod) for nod in noduri]
 
 
 class MinHeap:
     '''Priority queue folosit pentru UCS.
     
     Format dintr-un arbore binar de cautare balansat si un dictionar
-        care mapeaza starile la distanta minima de origine.
-    Nodurile se sorteaza dupa distanta lor fata de origine.
+        care mapeaza starile la cheia lor din arbore.
+    Nodurile se sorteaza dupa distanta lor fata de origine, apoi dupa politica de departajare.
     Inserarea, updatarea si stergerea oricarui nod pot fi facute in O(logN).
 
     Attributes:
         bt: arbore binar de cautare balansat care joaca rolul unui PQ.
-        state_distances: Dictionar care mapeaza starile la distanta minima de origine.
+        chei: Dictionar care mapeaza starile (sub forma de string, ca in Graf) la cheia lor din arbore.
             Utilizat pentru cautarea rapida in arborele binar a oricarei stari si pentru
             verificarea existentei oricarei stari in PQ.
+        departajare: Calculeaza componentele de departajare ale cheilor.
+        politica_departajare: Politica folosita cand nu este data una la constructie.
     '''
-    def __init__(self):
+    politica_departajare = 'lexicografic'
+    seed = 0
+
+    def __init__(self, politica: Optional[str] = None, seed: Optional[int] = None):
+        '''
+        Args:
+            politica: Una din POLITICI_DEPARTAJARE. Implicit, politica_departajare.
+            seed: Seed-ul pentru politica 'aleator'. Implicit, atributul de clasa seed.
+        '''
         self.bt = sbbst()
-        self.state_distances = {}
+        self.chei = {}
+        self.departajare = Departajare(
+            politica or self.politica_departajare, self.seed if seed is None else seed)
+
+    @property
+    def politica(self) -> str:
+        return self.departajare.politica
 
     def extract_min(self) -> NodParcurgere:
         '''Scoate cel mai apropiat nod de origine din priority queue si il returneaza.
@@ -83,87 +211,170 @@ class MinHeap:
         Returns:
             Nodul cu cheie minima.
         '''
-        nod = self.bt.getMinVal().nod
-        self.bt.delete(MinHeapKey(nod))
-        self.state_distances.pop(nod.state)
-        return nod
+        cheie = self.bt.getMinVal()
+        self.bt.delete(cheie)
+        self.chei.pop(cheie.stare)
+        return cheie.nod
 
     def is_empty(self) -> bool:
         '''Verifica daca numarul de noduri din PQ este 0.'''
-        return len(self.state_distances) == 0
+        return len(self.chei) == 0
+
+    def noduri(self) -> List[NodParcurgere]:
+        '''Nodurile din priority queue, in ordinea in care ar fi extrase.'''
+        return [cheie.nod for cheie in self.bt.inOrder()]
 
-    def insert(self, nod: NodParcurgere) -> None:
+    def departajari(self) -> List[tuple]:
+        '''Componentele de departajare ale cheilor, in aceeasi ordine ca noduri().'''
+        return [cheie.cheie[1:] for cheie in self.bt.inOrder()]
+
+    def insert(self, nod: NodParcurgere, departajare: Optional[tuple] = None,
+            stare: Optional[str] = None) -> None:
         '''
         Insereaza nodul in priority queue.
         Daca starea exista deja in priority queue cu o distanta mai mare de origine,
         nodul starii este updatat.
+
+        Args:
+            nod: Nodul inserat.
+            departajare: Componentele de departajare ale cheii. Implicit, calculate dupa politica PQ-ului.
+            stare: Reprezentarea starii nodului sub forma de string. Implicit, calculata din nod.
         '''
+        if stare is None:
+            stare = str(nod.state)
         # daca deja exista state-ul, vad daca trebuie updatat
-        if nod.state in self.state_distances:
+        if stare in self.chei:
+            cheie_veche = self.chei[stare]
             # if data in tree is outdated:
-            if self.state_distances[nod.state] > nod.g:
+            if cheie_veche.cheie[0] > nod.g:
                 # remove old node
-                old_node = NodParcurgere(nod.state, None, self.state_distances[nod.state])
-                self.bt.delete(MinHeapKey(old_node))
+                self.bt.delete(cheie_veche)
 
                 # insert updated data
-                self.state_distances[nod.state] = nod.g
-                self.bt.insert(MinHeapKey(nod))
+                cheie = MinHeapKey(nod, departajare or self.departajare(nod, stare), stare)
+                self.chei[stare] = cheie
+                self.bt.insert(cheie)
         else:
-            self.state_distances[nod.state] = nod.g
-            self.bt.insert(MinHeapKey(nod))
+            cheie = MinHeapKey(nod, departajare or self.departajare(nod, stare), stare)
+            self.chei[stare] = cheie
+            self.bt.insert(cheie)
+
+    def inserare_ordonata(self, noduri: Iterable[NodParcurgere],
+            departajari: Optional[List[tuple]] = None) -> None:
+        '''Reinsereaza nodurile intoarse de noduri() (ex: la reluarea dintr-un checkpoint),
+        astfel incat ordinea lor de extragere sa se pastreze si pentru politicile bazate
+        pe ordinea inserarii.
+
+        Args:
+            noduri: Nodurile, in ordinea in care ar fi fost extrase.
+            departajari: Componentele de departajare intoarse de departajari(). Cu ele, cheile sunt
+                identice cu cele dinainte de salvare; altfel sunt calculate din nou.
+        '''
+        noduri = list(noduri)
+        if departajari is None:
+            departajari = self.departajare.pentru_reinserare(noduri)
+        for nod, departajare in zip(noduri, departajari):
+            self.insert(nod, departajare)
 
 
 class AstarMinHeap:
     '''Priority queue folosit pentru A*.
     Format dintr-un arbore binar de cautare balansat si un dictionar
-        care mapeaza starile la f(nod_curent), distanta estimata a drumului origine -> nod_curent -> stare_finala.
-    Nodurile se sorteaza dupa f(nod_curent).
+        care mapeaza starile la cheia lor din arbore.
+    Nodurile se sorteaza dupa f(nod_curent), distanta estimata a drumului
+        origine -> nod_curent -> stare_finala, apoi dupa politica de departajare.
     Inserarea, updatarea si stergerea oricarui nod pot fi facute in O(logN).
+
+    Valoarea f a unui nod este cea retinuta in nod, care poate fi mai mare decat g+h
+    (ex: in A* cu expandare partiala).
     '''
-    def __init__(self):
+    politica_departajare = 'lexicografic'
+    seed = 0
+
+    def __init__(self, politica: Optional[str] = None, seed: Optional[int] = None):
+        '''
+        Args:
+            politica: Una din POLITICI_DEPARTAJARE. Implicit, politica_departajare.
+            seed: Seed-ul pentru politica 'aleator'. Implicit, atributul de clasa seed.
+        '''
         self.bt = sbbst()
-        self.origin_distances = {}
-        self.estimated_distances = {}
+        self.chei = {}
+        self.departajare = Departajare(
+            politica or self.politica_departajare, self.seed if seed is None else seed)
+
+    @property
+    def politica(self) -> str:
+        return self.departajare.politica
 
     def extract_min(self) -> NodParcurgere:
         '''
         Scoate nodul cu f(nod) minim din priority queue si il returneaza.
         '''
-        nod = self.bt.getMinVal().nod
-        self.bt.delete(AstarMinHeapKey(nod))
-        self.origin_distances.pop(nod.state)
-        self.estimated_distances.pop(nod.state)
-        return nod
+        cheie = self.bt.getMinVal()
+        self.bt.delete(cheie)
+        self.chei.pop(cheie.stare)
+        return cheie.nod
 
     def is_empty(self) -> bool:
-        return len(self.origin_distances) == 0
+        return len(self.chei) == 0
+
+    def noduri(self) -> List[NodParcurgere]:
+        '''Nodurile din priority queue, in ordinea in care ar fi extrase.'''
+        return [cheie.nod for cheie in self.bt.inOrder()]
+
+    def departajari(self) -> List[tuple]:
+        '''Componentele de departajare ale cheilor, in aceeasi ordine ca noduri().'''
+        return [cheie.cheie[1:] for cheie in self.bt.inOrder()]
 
-    def insert(self, nod: NodParcurgere):
+    def insert(self, nod: NodParcurgere, departajare: Optional[tuple] = None,
+            stare: Optional[str] = None):
         '''
         Insereaza nodul in priority queue.
         Daca starea exista deja in priority queue cu f(nod_vechi) mai mare decat f(nod_nou),
         nodul starii este updatat.
+
+        Args:
+            nod: Nodul inserat.
+            departajare: Componentele de departajare ale cheii. Implicit, calculate dupa politica PQ-ului.
+            stare: Reprezentarea starii nodului sub forma de string. Implicit, calculata din nod.
         '''
+        if stare is None:
+            stare = str(nod.state)
         # daca deja exista state-ul, vad daca trebuie updatat
-        if nod.state in self.origin_distances:
+        if stare in self.chei:
+            cheie_veche = self.chei[stare]
             # if data in tree is outdated:
-            old_g = self.origin_distances[nod.state]
-            old_h = self.estimated_distances[nod.state]
-            old_f = old_g + old_h
+            old_g = cheie_veche.g
+            old_f = cheie_veche.cheie[0]
             if (
                 old_f > nod.f or
                 (old_f == nod.f and old_g > nod.g)
             ):
                 # remove old node
-                old_node = NodParcurgere(nod.state, None, old_g, old_h)
-                self.bt.delete(AstarMinHeapKey(old_node))
+                self.bt.delete(cheie_veche)
 
                 # insert updated data
-                self.origin_distances[nod.state] = nod.g
-                self.estimated_distances[nod.state] = nod.h
-                self.bt.insert(AstarMinHeapKey(nod))
+                cheie = AstarMinHeapKey(nod, departajare or self.departajare(nod, stare), stare)
+                self.chei[stare] = cheie
+                self.bt.insert(cheie)
         else:
-            self.origin_distances[nod.state] = nod.g
-            self.estimated_distances[nod.state] = nod.h
-            self.bt.insert(AstarMinHeapKey(nod))
+            cheie = AstarMinHeapKey(nod, departajare or self.departajare(nod, stare), stare)
+            self.chei[stare] = cheie
+            self.bt.insert(cheie)
+
+    def inserare_ordonata(self, noduri: Iterable[NodParcurgere],
+            departajari: Optional[List[tuple]] = None) -> None:
+        '''Reinsereaza nodurile intoarse de noduri() (ex: la reluarea dintr-un checkpoint),
+        astfel incat ordinea lor de extragere sa se pastreze si pentru politicile bazate
+        pe ordinea inserarii.
+
+        Args:
+            noduri: Nodurile, in ordinea in care ar fi fost extrase.
+            departajari: Componentele de departajare intoarse de departajari(). Cu ele, cheile sunt
+                identice cu cele dinainte de salvare; altfel sunt calculate din nou.
+        '''
+        noduri = list(noduri)
+        if departajari is None:
+            departajari = self.departajare.pentru_reinserare(noduri)
+        for nod, departajare in zip(noduri, departajari):
+            self.insert(nod, departajare)
@@ -0,0 +1,170 @@
+from typing import Dict, List, Optional
+import argparse
+import heapq
+import random
+import time
+
+from graf import *
+from state_representation import *
+from util import *
+
+
+EURISTICI = ['euristica_banala', 'euristica_admisibila_1', 'euristica_admisibila_2', 'euristica_neadmisibila']
+
+
+def componenta(start: State, max_stari: int) -> Optional[Dict[str, State]]:
+    '''Toate starile accesibile din start, sau None daca sunt mai mult de max_stari.'''
+    stari = {str(start): start}
+    stiva = [start]
+    while len(stiva) > 0:
+        state = stiva.pop()
+        for sursa, destinatie, cost in state.mutari_valide():
+            succesor = state.aplica_mutare(sursa, destinatie)
+            cheie = str(succesor)
+            if cheie not in stari:
+                if len(stari) >= max_stari:
+                    return None
+                stari[cheie] = succesor
+                stiva.append(succesor)
+    return stari
+
+
+def distante_exacte(stari: Dict[str, State]) -> Dict[str, int]:
+    '''Costul exact h* pana la cea mai apropiata stare finala, pentru fiecare stare din componenta.
+
+    UCS pornit simultan din toate starile finale. Mutarile sunt reversibile si au acelasi cost
+    in ambele sensuri, deci distantele pe graful invers sunt egale cu cele pe graful direct.
+    '''
+    distante = {}
+    frontiera = [(0, cheie) for cheie, state in stari.items() if state.is_end_state()]
+    heapq.heapify(frontiera)
+    while len(frontiera) > 0:
+        distanta, cheie = heapq.heappop(frontiera)
+        if cheie in distante:
+            continue
+        distante[cheie] = distanta
+        state = stari[cheie]
+        for sursa, destinatie, cost in state.mutari_valide():
+            cheie_vecin = str(state.aplica_mutare(sursa, destinatie))
+            if cheie_vecin not in distante:
+                heapq.heappush(frontiera, (distanta + cost, cheie_vecin))
+    return distante
+
+
+class ProfilEuristica:
+    '''Statisticile unei euristici pe o clasa de instante.
+
+    Attributes:
+        apeluri: Numarul de evaluari cronometrate.
+        timp_ns: Timpul total al evaluarilor cronometrate.
+        stari: Numarul de stari evaluate.
+        suma_raport: Suma rapoartelor h/h* pentru starile cu h* > 0.
+        stari_raport: Numarul de stari cu h* > 0.
+        neadmisibile: Numarul de stari cu h > h*.
+        muchii: Numarul de muchii verificate.
+        inconsistente: Numarul de muchii (s, t) cu h(s) > cost(s, t) + h(t).
+    '''
+    def __init__(self):
+        self.apeluri = 0
+        self.timp_ns = 0
+        self.stari = 0
+        self.suma_raport = 0.0
+        self.stari_raport = 0
+        self.neadmisibile = 0
+        self.muchii = 0
+        self.inconsistente = 0
+
+    def adauga(self, nod: NodParcurgere, euristica: str, esantion: List[State], stari: Dict[str, State],
+            distante: Dict[str, int], repetari: int) -> None:
+        '''Evalueaza euristica pe starile din esantion si pe vecinii lor.'''
+        start_ns = time.perf_counter_ns()
+        for i in range(repetari):
+            for state in esantion:
+                nod.calculeaza_h(state, euristica)
+        self.timp_ns += time.perf_counter_ns() - start_ns
+        self.apeluri += repetari * len(esantion)
+
+        for state in esantion:
+            h = nod.calculeaza_h(state, euristica)
+            h_exact = distante[str(state)]
+            self.stari += 1
+            if h > h_exact:
+                self.neadmisibile += 1
+            if h_exact > 0:
+                self.suma_raport += h / h_exact
+                self.stari_raport += 1
+            for sursa, destinatie, cost in state.mutari_valide():
+                with state.mutare_temporara(sursa, destinatie) as vecin:
+                    h_vecin = nod.calculeaza_h(vecin, euristica)
+                self.muchii += 1
+                if h > cost + h_vecin:
+                    self.inconsistente += 1
+
+    def rand(self, nume: str) -> str:
+        raport = self.suma_raport / self.stari_raport if self.stari_raport > 0 else 0.0
+        return '%-24s %10.0f %8.3f %9d %8.2f%% %9d %8.2f%%' % (
+            nume, self.timp_ns / max(self.apeluri, 1), raport,
+            self.neadmisibile, 100.0 * self.neadmisibile / max(self.stari, 1),
+            self.inconsistente, 100.0 * self.inconsistente / max(self.muchii, 1))
+
+
+def afiseaza_raport(titlu: str, profiluri: Dict[str, ProfilEuristica], numar_instante: int,
+        numar_stari: int) -> None:
+    print('%s: %d instante, %d stari' % (titlu, numar_instante, numar_stari))
+    print('%-24s %10s %8s %9s %9s %9s %9s' % (
+        'euristica', 'ns/apel', 'h/h*', 'h > h*', '%', 'inconsist', '%'))
+    for euristica in EURISTICI:
+        print(profiluri[euristica].rand(euristica))
+    print()
+
+
+if __name__ == "__main__":
+    # profileaza euristicile din NodParcurgere.calculeaza_h pe instante generate aleator
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--instante', type=int, default=10,
+        help='Numarul de instante din fiecare clasa.')
+    parser.add_argument('--stive', type=int, nargs='+', default=[3, 4],
+        help='Numerele de stive ale claselor de instante.')
+    parser.add_argument('--blocuri', type=int, nargs='+', default=[5, 6],
+        help='Numerele de blocuri ale claselor de instante.')
+    parser.add_argument('--esantion', type=int, default=200,
+        help='Numarul maxim de stari evaluate din fiecare instanta.')
+    parser.add_argument('--repetari', type=int, default=5,
+        help='De cate ori este cronometrata fiecare evaluare.')
+    parser.add_argument('--max-stari', type=int, default=100000,
+        help='Instantele cu mai multe stari accesibile sunt ignorate.')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    nod = NodParcurgere(None, None)
+    total = {euristica: ProfilEuristica() for euristica in EURISTICI}
+    total_instante = 0
+    total_stari = 0
+    for k in args.stive:
+        for numar_blocuri in args.blocuri:
+            profiluri = {euristica: ProfilEuristica() for euristica in EURISTICI}
+            numar_instante = 0
+            numar_stari = 0
+            incercari = 0
+            while numar_instante < args.instante and incercari < 20 * args.instante:
+                incercari += 1
+                start = genereaza_instanta(rng, k, numar_blocuri)
+                stari = componenta(start, args.max_stari)
+                if stari is None:
+                    continue
+                distante = distante_exacte(stari)
+                # instantele fara solutii nu au h* finit
+                if str(start) not in distante:
+                    continue
+                chei = list(stari.keys())
+                esantion = [stari[cheie] for cheie in rng.sample(chei, min(args.esantion, len(chei)))]
+                for euristica in EURISTICI:
+                    for profil in (profiluri[euristica], total[euristica]):
+                        profil.adauga(nod, euristica, esantion, stari, distante, args.repetari)
+                numar_instante += 1
+                numar_stari += len(esantion)
+            afiseaza_raport('k = %d, N = %d' % (k, numar_blocuri), profiluri, numar_instante, numar_stari)
+            total_instante += numar_instante
+            total_stari += numar_stari
+    afiseaza_raport('Toate clasele', total, total_instante, total_stari)
@@ -0,0 +1,194 @@
+from array import array
+from math import comb, factorial
+from typing import Iterator, List, Optional, Tuple
+import mmap
+import os
+
+from state_representation import *
+
+# Spatiile cu mai multe stari nu sunt explorate exhaustiv implicit (bitmap-ul ar avea peste 4 MB).
+# Spatii mai mari pot fi explorate dand explicit max_stari, eventual cu bitmap-ul mapat intr-un fisier.
+MAX_STARI_EXPLORARE = 2**24
+
+
+class RangStari:
+    '''Numerotare perfecta a starilor unei instante: fiecare asezare a blocurilor pe cele k stive
+    primeste un intreg unic din [0, numar_stari) si orice intreg din interval corespunde unei asezari.
+
+    rang = rangul Lehmer al permutarii blocurilor (citite stiva cu stiva, de jos in sus)
+        * C(N+k-1, k-1) + rangul compozitiei inaltimilor (h_0, ..., h_k-1).
+    Blocurile sunt identificate dupa nume, ca in State.__str__.
+
+    Attributes:
+        blocuri: Blocurile instantei, in ordinea din starea initiala.
+        index: Dictionar nume -> indicele blocului in blocuri.
+        k: Numarul de stive.
+        numar_compozitii: Numarul de moduri in care N blocuri pot fi impartite pe k stive.
+        numar_stari: N! * numar_compozitii.
+    '''
+    def __init__(self, start: State):
+        '''
+        Args:
+            start: Starea initiala a instantei. Numele blocurilor trebuie sa fie unice.
+        '''
+        self.blocuri = [bloc for stiva in start.s for bloc in stiva.s]
+        self.index = {bloc.nume: i for i, bloc in enumerate(self.blocuri)}
+        if len(self.index) != len(self.blocuri):
+            raise ValueError('Numele blocurilor trebuie sa fie unice.')
+        self.k = len(start.s)
+        n = len(self.blocuri)
+        self.numar_compozitii = comb(n + self.k - 1, self.k - 1)
+        self.numar_stari = factorial(n) * self.numar_compozitii
+        self._factoriale = [factorial(i) for i in range(n + 1)]
+
+    def rang(self, state: State) -> int:
+        '''Intregul asociat starii.'''
+        permutare = [self.index[bloc.nume] for stiva in state.s for bloc in stiva.s]
+        n = len(permutare)
+        rang_permutare = 0
+        for i in range(n):
+            mai_mici = 0
+            for j in range(i + 1, n):
+                if permutare[j] < permutare[i]:
+                    mai_mici += 1
+            rang_permutare += mai_mici * self._factoriale[n - 1 - i]
+
+        # pozitiile celor k-1 separatori intre N+k-1 locuri, in sistemul combinatorial de numeratie
+        rang_compozitie = 0
+        pozitie = -1
+        for j, stiva in enumerate(state.s[:-1]):
+            pozitie += stiva.get_height() + 1
+            rang_compozitie += comb(pozitie, j + 1)
+        return rang_permutare * self.numar_compozitii + rang_compozitie
+
+    def stare(self, rang: int) -> State:
+        '''Starea asociata unui intreg din [0, numar_stari).'''
+        rang_permutare, rang_compozitie = divmod(rang, self.numar_compozitii)
+
+        ramase = list(range(len(self.blocuri)))
+        permutare = []
+        for i in range(len(ramase) - 1, -1, -1):
+            cat, rang_permutare = divmod(rang_permutare, self._factoriale[i])
+            permutare.append(ramase.pop(cat))
+
+        pozitii = []
+        for j in range(self.k - 1, 0, -1):
+            pozitie = j - 1
+            while comb(pozitie + 1, j) <= rang_compozitie:
+                pozitie += 1
+            rang_compozitie -= comb(pozitie, j)
+            pozitii.append(pozitie)
+        pozitii.reverse()
+
+        stive = []
+        inceput = 0
+        anterior = -1
+        for pozitie in pozitii + [len(self.blocuri) + self.k - 1]:
+            inaltime = pozitie - anterior - 1
+            stive.append([self.blocuri[i] for i in permutare[inceput:inceput + inaltime]])
+            inceput += inaltime
+            anterior = pozitie
+        return State.din_stive(stive)
+
+
+class BitmapStari:
+    '''Tablou de celule de 1 sau 2 biti indexat dupa rangul starilor, tinut in memorie
+    (bytearray) sau intr-un fisier mapat in memorie.
+
+    Attributes:
+        biti: Numarul de biti ai unei celule (1 sau 2).
+        date: bytearray sau mmap.
+    '''
+    def __init__(self, numar_stari: int, biti: int = 1, cale: Optional[str] = None):
+        '''
+        Args:
+            numar_stari: Numarul de celule.
+            biti: Numarul de biti ai unei celule (1 sau 2).
+            cale: Fisierul in care este tinut tabloul. Daca este None, tabloul este tinut in memorie.
+        '''
+        if biti not in (1, 2):
+            raise ValueError('O celula are 1 sau 2 biti.')
+        self.biti = biti
+        self.cale = cale
+        dimensiune = (numar_stari * biti + 7) // 8
+        if cale is None:
+            self.date = bytearray(dimensiune)
+        else:
+            with open(cale, 'wb') as fisier:
+                fisier.truncate(max(dimensiune, 1))
+            self._fisier = open(cale, 'r+b')
+            self.date = mmap.mmap(self._fisier.fileno(), 0)
+
+    def __getitem__(self, rang: int) -> int:
+        bit = rang * self.biti
+        return (self.date[bit >> 3] >> (bit & 7)) & ((1 << self.biti) - 1)
+
+    def __setitem__(self, rang: int, valoare: int) -> None:
+        bit = rang * self.biti
+        masca = ((1 << self.biti) - 1) << (bit & 7)
+        self.date[bit >> 3] = (self.date[bit >> 3] & ~masca) | (valoare << (bit & 7))
+
+    def inchide(self) -> None:
+        '''Elibereaza tabloul; fisierul, daca exista, este sters.'''
+        if self.cale is not None:
+            self.date.close()
+            self._fisier.close()
+            os.remove(self.cale)
+
+
+def parcurgere_ranguri(rang_stari: RangStari, start: State, vizitate: BitmapStari
+        ) -> Iterator[Tuple[int, State, int]]:
+    '''BFS pe ranguri: frontiera este un tablou de intregi, iar starile vizitate sunt marcate in
+    bitmap cu (adancime mod 3) + 1, suficient pentru reconstruirea drumurilor (vezi drum_catre).
+
+    Args:
+        rang_stari: Numerotarea starilor instantei.
+        start: Starea initiala.
+        vizitate: Bitmap cu celule de 2 biti si cel putin rang_stari.numar_stari celule, initial zero.
+
+    Yields:
+        (rang, stare, adancime) pentru fiecare stare accesibila, in ordinea BFS.
+    '''
+    rang_start = rang_stari.rang(start)
+    vizitate[rang_start] = 1
+    strat = array('Q', [rang_start])
+    adancime = 0
+    while len(strat) > 0:
+        eticheta = (adancime + 1) % 3 + 1
+        strat_urmator = array('Q')
+        for rang in strat:
+            state = rang_stari.stare(rang)
+            yield rang, state, adancime
+            for sursa, destinatie, cost in state.mutari_valide():
+                with state.mutare_temporara(sursa, destinatie) as state_successor:
+                    rang_successor = rang_stari.rang(state_successor)
+                if vizitate[rang_successor] == 0:
+                    vizitate[rang_successor] = eticheta
+                    strat_urmator.append(rang_successor)
+        strat = strat_urmator
+        adancime += 1
+
+
+def drum_catre(rang_stari: RangStari, vizitate: BitmapStari, rang: int, adancime: int
+        ) -> List[Tuple[int, int]]:
+    '''Reconstruieste un drum de lungime minima de la starea initiala la starea cu rangul dat,
+    folosind etichetele puse de parcurgere_ranguri. Mutarile sunt reversibile, deci vecinii unei
+    stari de la adancimea d sunt la adancimile d-1, d, d+1, care au etichete diferite.
+
+    Returns:
+        Mutarile (sursa, destinatie) ale drumului, de la starea initiala.
+    '''
+    mutari = []
+    state = rang_stari.stare(rang)
+    while adancime > 0:
+        eticheta = (adancime - 1) % 3 + 1
+        for sursa, destinatie, cost in state.mutari_valide():
+            with state.mutare_temporara(sursa, destinatie) as state_anterior:
+                rang_anterior = rang_stari.rang(state_anterior)
+            if vizitate[rang_anterior] == eticheta:
+                mutari.append((destinatie, sursa))
+                state = state.aplica_mutare(sursa, destinatie)
+                break
+        adancime -= 1
+    mutari.reverse()
+    return mutari
@@ -1,4 +1,5 @@
-from typing import Iterable
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Tuple
 import copy
 
 
@@ -62,6 +63,15 @@ class Stiva:
             weight_sum += bloc.greutate
         return True
 
+    def capacitate(self) -> float:
+        '''Greutatea maxima care mai poate fi pusa pe stiva fara a depasi rezistenta vreunui bloc.'''
+        capacitate = float('inf')
+        weight_sum = 0
+        for bloc in reversed(self.s):
+            capacitate = min(capacitate, bloc.rezistenta - weight_sum)
+            weight_sum += bloc.greutate
+        return capacitate
+
     def get_height(self) -> int:
         '''Numarul de blocuri din stiva.'''
         return len(self.s)
@@ -95,27 +105,81 @@ class State:
                 stiva = Stiva(line)
                 self.s.append(stiva)
 
+    @classmethod
+    def din_stive(cls, stive: Iterable[Iterable[Bloc]]) -> 'State':
+        '''Construieste o stare din listele de blocuri ale stivelor, fara a citi un fisier.
+
+        Args:
+            stive: Blocurile fiecarei stive, de jos in sus.
+        '''
+        state = cls.__new__(cls)
+        state.s = []
+        for blocuri in stive:
+            stiva = Stiva('_')
+            stiva.s = list(blocuri)
+            state.s.append(stiva)
+        return state
+
+    def mutari_valide(self) -> Iterator[Tuple[int, int, int]]:
+        '''Genereaza lenes mutarile valide din starea curenta, fara a construi starile succesoare.
+
+        Yields:
+            Tupluri (sursa, destinatie, cost), unde cost este greutatea blocului mutat.
+        '''
+        capacitati = [stiva.capacitate() for stiva in self.s]
+        for sursa, stiva in enumerate(self.s):
+            if len(stiva.s) == 0:
+                continue
+            greutate = stiva.s[-1].greutate
+            for destinatie in range(len(self.s)):
+                if destinatie != sursa and greutate <= capacitati[destinatie]:
+                    yield sursa, destinatie, greutate
+
     def generate_successors(self) -> Iterable['State']:
         '''Genereaza toate starile valide care pot urma starea curenta.'''
         states = []
         costs = []
-        for stiva in self.s:
-            if len(stiva.s) == 0:
-                continue
-            bloc = stiva.s.pop()
-            for stiva_ad in self.s:
-                if stiva_ad == stiva:
-                    continue
-                stiva_ad.s.append(bloc)
-                if stiva_ad.is_valid():
-                    states.append(copy.deepcopy(self))
-                    costs.append(bloc.greutate)
-                stiva_ad.s.pop()
-
-            stiva.s.append(bloc)
+        for sursa, destinatie, cost in self.mutari_valide():
+            states.append(self.aplica_mutare(sursa, destinatie))
+            costs.append(cost)
 
         return states, costs
 
+    def aplica_mutare(self, sursa: int, destinatie: int) -> 'State':
+        '''Construieste starea obtinuta prin mutarea blocului din varful stivei sursa
+        pe stiva destinatie. Starea curenta nu este modificata.
+
+        Blocurile sunt partajate intre stari (nu sunt modificate niciodata), doar listele
+        stivelor sunt copiate, deci operatia este mult mai ieftina decat copy.deepcopy.
+
+        Args:
+            sursa: Indicele stivei de pe care se ia blocul.
+            destinatie: Indicele stivei pe care se pune blocul.
+        '''
+        state = copy.copy(self)
+        state.s = []
+        for stiva in self.s:
+            stiva_noua = copy.copy(stiva)
+            stiva_noua.s = list(stiva.s)
+            state.s.append(stiva_noua)
+        state.s[destinatie].s.append(state.s[sursa].s.pop())
+        return state
+
+    @contextmanager
+    def mutare_temporara(self, sursa: int, destinatie: int) -> Iterator['State']:
+        '''Muta temporar blocul din varful stivei sursa pe stiva destinatie, fara copiere.
+        Mutarea este anulata la iesirea din bloc, chiar daca apare o exceptie (ex: timeout).
+
+        Args:
+            sursa: Indicele stivei de pe care se ia blocul.
+            destinatie: Indicele stivei pe care se pune blocul.
+        '''
+        self.s[destinatie].s.append(self.s[sursa].s.pop())
+        try:
+            yield self
+        finally:
+            self.s[sursa].s.append(self.s[destinatie].s.pop())
+
     def is_valid(self) -> bool:
         '''Verifica daca in starea curenta exista blocuri bloc cu rezistenta depasita.'''
         for stiva in self.s:
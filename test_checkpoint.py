@@ -0,0 +1,83 @@
+import io
+import os
+import random
+
+import pytest
+
+import checkpoint
+from checkpoint import *
+from graf import *
+from main import breadth_first_search, uniform_cost_search, a_star
+from priority_queues import *
+from state_representation import *
+from util import *
+
+# o cautare reluata este oprita din nou dupa atatea expandari
+PAS = 3
+
+CAUTARI = [
+    (breadth_first_search, None),
+    (uniform_cost_search, None),
+    (a_star, 'euristica_admisibila_2'),
+    (a_star, 'euristica_neadmisibila'),
+]
+
+
+def verifica_des(self, noduri, numar_solutii, start_time):
+    '''Inlocuieste CheckpointCautare.verifica: salveaza si opreste cautarea dupa PAS expandari.'''
+    if self.cale is None:
+        return False
+    if not hasattr(self, '_prima_expandare'):
+        self._prima_expandare = self.graf.numar_expandari
+    if self.graf.numar_expandari - self._prima_expandare >= PAS:
+        frontiera, expandate, departajari = noduri()
+        self.salveaza(frontiera, expandate, numar_solutii, start_time, departajari)
+        return True
+    return False
+
+
+def fara_timpi(text: str) -> str:
+    return '\n'.join([linie for linie in text.splitlines() if not linie.startswith('Timpul')])
+
+
+def ruleaza(algoritm, euristica, start: State, cale: str = None):
+    graf = Graf(start)
+    f = io.StringIO()
+    if euristica is None:
+        algoritm(graf, 3, f, checkpoint=cale)
+    else:
+        algoritm(graf, 3, f, euristica, checkpoint=cale)
+    return fara_timpi(f.getvalue()), graf.numar_expandari
+
+
+def instante() -> list:
+    rng = random.Random(0)
+    stari = [State(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+        'input_folder', 'input_gresit_neadmisibila.txt'))]
+    while len(stari) < 8:
+        stari.append(genereaza_instanta(rng, rng.randint(3, 4), rng.randint(4, 6)))
+    return stari
+
+
+@pytest.mark.parametrize('politica', ['lexicografic', 'lifo', 'aleator'])
+def test_reluarea_da_aceleasi_rezultate(monkeypatch, tmp_path, politica):
+    for heap in (MinHeap, AstarMinHeap):
+        monkeypatch.setattr(heap, 'politica_departajare', politica)
+        monkeypatch.setattr(heap, 'seed', 7)
+    cale = str(tmp_path / 'cautare.ckpt')
+    total_reluari = 0
+    for start in instante():
+        for algoritm, euristica in CAUTARI:
+            asteptat = ruleaza(algoritm, euristica, start)
+
+            with monkeypatch.context() as m:
+                m.setattr(checkpoint.CheckpointCautare, 'verifica', verifica_des)
+                reluari = 0
+                while True:
+                    rezultat = ruleaza(algoritm, euristica, start, cale)
+                    if not os.path.exists(cale):
+                        break
+                    reluari += 1
+            assert rezultat == asteptat, (algoritm.__name__, euristica, str(start), reluari)
+            total_reluari += reluari
+    assert total_reluari > 0
@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+import numpy_backend
+from graf import *
+from state_representation import *
+from util import *
+
+EURISTICI = ['euristica_banala', 'euristica_admisibila_1', 'euristica_admisibila_2', 'euristica_neadmisibila']
+
+pytestmark = pytest.mark.skipif(not numpy_backend.numpy_disponibil(), reason='numpy nu este instalat')
+
+
+def stari_de_test(seed: int = 0) -> list:
+    '''Loturi de stari valide (fiecare lot dintr-o singura instanta), inclusiv cu stive goale.'''
+    rng = random.Random(seed)
+    loturi = []
+    for k in (1, 2, 3, 4, 6):
+        for numar_blocuri in (0, 1, 2, 5, 8):
+            start = genereaza_instanta(rng, k, numar_blocuri)
+            loturi.append(plimbare_aleatoare(rng, start, 15))
+
+    # toate blocurile pe o singura stiva, restul stivelor goale
+    blocuri = [Bloc('b%d'%(i), 1, 100) for i in range(6)]
+    start = State.din_stive([blocuri, [], [], []])
+    loturi.append(plimbare_aleatoare(rng, start, 15))
+    return loturi
+
+
+def evalueaza(monkeypatch, state: State, euristica: str, backend: str) -> list:
+    monkeypatch.setattr(NodParcurgere, 'backend', backend)
+    return list(NodParcurgere(state, None).evalueaza_mutari(euristica))
+
+
+@pytest.mark.parametrize('euristica', EURISTICI)
+def test_evalueaza_mutari_numpy_egal_cu_python(monkeypatch, euristica):
+    for lot in stari_de_test():
+        for state in lot:
+            assert (evalueaza(monkeypatch, state, euristica, 'numpy') ==
+                evalueaza(monkeypatch, state, euristica, 'python')), str(state)
+
+
+@pytest.mark.parametrize('euristica', EURISTICI)
+def test_calculeaza_h_batch_egal_cu_calculeaza_h(euristica):
+    nod = NodParcurgere(None, None)
+    for lot in stari_de_test(1):
+        asteptat = [nod.calculeaza_h(state, euristica) for state in lot]
+        assert numpy_backend.calculeaza_h_batch(lot, euristica) == asteptat
+
+
+def test_calculeaza_h_batch_fara_stari():
+    assert numpy_backend.calculeaza_h_batch([], 'euristica_admisibila_2') == []
+
+
+def test_succesori_numpy_egali_cu_python(monkeypatch):
+    # succesorii construiti din mutarile calculate cu numpy au aceleasi stari ca cei din python
+    for lot in stari_de_test(2):
+        for state in lot[:3]:
+            succesori = {}
+            for backend in ('python', 'numpy'):
+                monkeypatch.setattr(NodParcurgere, 'backend', backend)
+                succesori[backend] = [(str(succesor.state), succesor.g, succesor.h)
+                    for succesor in NodParcurgere(state, None).generate_successors('euristica_admisibila_2')]
+            assert succesori['numpy'] == succesori['python']
@@ -0,0 +1,98 @@
+import os
+import random
+
+import pytest
+
+from rang_stari import *
+from state_representation import *
+from util import *
+
+
+def componenta(start: State) -> list:
+    '''Toate starile accesibile din start.'''
+    stari = {str(start): start}
+    stiva = [start]
+    while len(stiva) > 0:
+        state = stiva.pop()
+        for sursa, destinatie, cost in state.mutari_valide():
+            succesor = state.aplica_mutare(sursa, destinatie)
+            if str(succesor) not in stari:
+                stari[str(succesor)] = succesor
+                stiva.append(succesor)
+    return list(stari.values())
+
+
+def instante(numar: int, seed: int = 0, max_blocuri: int = 6) -> list:
+    rng = random.Random(seed)
+    return [genereaza_instanta(rng, rng.randint(1, 4), rng.randint(0, max_blocuri)) for i in range(numar)]
+
+
+def test_stare_inversa_rangului():
+    rng = random.Random(1)
+    for start in instante(200):
+        rang_stari = RangStari(start)
+        for state in plimbare_aleatoare(rng, start, 20):
+            rang = rang_stari.rang(state)
+            assert 0 <= rang < rang_stari.numar_stari
+            assert str(rang_stari.stare(rang)) == str(state)
+
+
+def test_rang_invers_starii():
+    rng = random.Random(2)
+    for start in instante(50, 3):
+        rang_stari = RangStari(start)
+        for i in range(20):
+            rang = rng.randrange(rang_stari.numar_stari)
+            assert rang_stari.rang(rang_stari.stare(rang)) == rang
+
+
+def test_ranguri_unice_pe_componenta():
+    for start in instante(30, 4, 4):
+        rang_stari = RangStari(start)
+        stari = componenta(start)
+        ranguri = set([rang_stari.rang(state) for state in stari])
+        assert len(ranguri) == len(stari)
+
+
+def test_parcurgere_ranguri_viziteaza_componenta():
+    for start in instante(30, 5, 4):
+        rang_stari = RangStari(start)
+        vizitate = BitmapStari(rang_stari.numar_stari, 2)
+        stari = [str(state) for rang, state, adancime in parcurgere_ranguri(rang_stari, start, vizitate)]
+        assert sorted(stari) == sorted([str(state) for state in componenta(start)])
+
+
+def test_drum_catre_are_lungime_minima():
+    for start in instante(20, 6, 4):
+        rang_stari = RangStari(start)
+        vizitate = BitmapStari(rang_stari.numar_stari, 2)
+        for rang, state, adancime in list(parcurgere_ranguri(rang_stari, start, vizitate)):
+            mutari = drum_catre(rang_stari, vizitate, rang, adancime)
+            assert len(mutari) == adancime
+            curenta = start
+            for sursa, destinatie in mutari:
+                assert (sursa, destinatie) in [(s, d) for s, d, cost in curenta.mutari_valide()]
+                curenta = curenta.aplica_mutare(sursa, destinatie)
+            assert str(curenta) == str(state)
+
+
+@pytest.mark.parametrize('biti', [1, 2])
+def test_bitmap_in_memorie_si_in_fisier(tmp_path, biti):
+    rng = random.Random(biti)
+    for cale in (None, str(tmp_path / 'bitmap')):
+        bitmap = BitmapStari(1000, biti, cale)
+        valori = {}
+        for i in range(500):
+            rang = rng.randrange(1000)
+            valori[rang] = rng.randrange(1 << biti)
+            bitmap[rang] = valori[rang]
+        for rang in range(1000):
+            assert bitmap[rang] == valori.get(rang, 0)
+        bitmap.inchide()
+        assert cale is None or not os.path.exists(cale)
+
+
+def test_nume_duplicate():
+    state = State.din_stive([[Bloc('a', 3, 10), Bloc('a', 2, 14)], [Bloc('b', 1, 10)], []])
+    with pytest.raises(ValueError):
+        RangStari(state)
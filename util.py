@@ -0,0 +1,29 @@
+from typing import List
+import random
+
+from state_representation import *
+
+
+def genereaza_instanta(rng: random.Random, k: int, numar_blocuri: int, greutate_maxima: int = 10,
+        rezistenta_maxima: int = 25) -> State:
+    '''Genereaza o stare initiala valida cu blocuri aleatoare, asezate aleator pe k stive.'''
+    while True:
+        stive = [[] for i in range(k)]
+        for i in range(numar_blocuri):
+            bloc = Bloc('b%d'%(i), rng.randint(1, greutate_maxima), rng.randint(0, rezistenta_maxima))
+            stive[rng.randrange(k)].append(bloc)
+        state = State.din_stive(stive)
+        if state.is_valid():
+            return state
+
+
+def plimbare_aleatoare(rng: random.Random, state: State, pasi: int) -> List[State]:
+    '''Starile intalnite pe un drum aleator de mutari valide, pornind din state.'''
+    stari = [state]
+    for i in range(pasi):
+        mutari = list(stari[-1].mutari_valide())
+        if len(mutari) == 0:
+            break
+        sursa, destinatie, cost = rng.choice(mutari)
+        stari.append(stari[-1].aplica_mutare(sursa, destinatie))
+    return stari